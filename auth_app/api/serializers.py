@@ -1,6 +1,16 @@
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+
+# Case-insensitive unique index created by auth_app/migrations/0001_lowercase_user_email.py.
+EMAIL_UNIQUE_INDEX = 'auth_user_email_lower_uniq'
+
+
+def _violated_constraint(exc):
+    """Return the constraint name behind an IntegrityError (psycopg), else its message."""
+    diag = getattr(exc.__cause__, 'diag', None)
+    return getattr(diag, 'constraint_name', None) or str(exc)
 
 
 class RegistrationSerializer(serializers.ModelSerializer):
@@ -11,13 +21,16 @@ class RegistrationSerializer(serializers.ModelSerializer):
     - confirmed_password: write-only field used to verify the password matches.
     - email: required email address which must be unique among users.
     Validation:
-    - validate_confirmed_password ensures that the provided password and confirmed_password match,
-        raising serializers.ValidationError('Passwords do not match') when they differ.
-    - validate_email ensures the provided email is not already in use, raising
-        serializers.ValidationError('Email already exists') if a duplicate is found.
+    - validate() compares the already-parsed password and confirmed_password, raising
+        serializers.ValidationError({'confirmed_password': 'Passwords do not match'}) when they
+        differ. confirmed_password is popped so it does not end up in validated_data.
+    - validate_email() only lowercases the address; uniqueness is not checked with a query.
     Behavior:
-    - On successful validation, save() constructs a new User instance with the given username and email,
-        uses set_password() to hash and set the password, saves the instance to the database, and returns it.
+    - save() calls User.objects.create_user() (which hashes the password) inside a savepoint.
+        Duplicates are caught by the database: an IntegrityError on the
+        auth_user_email_lower_uniq index becomes {'email': 'Email already exists'}, one on
+        the username constraint becomes a 'username' error (e.g. a concurrent registration
+        that passed the UniqueValidator), and any other IntegrityError is re-raised.
     - Password and confirmed_password are write-only and are not exposed in serialized output.
     """
     confirmed_password = serializers.CharField(write_only=True)
@@ -34,24 +47,32 @@ class RegistrationSerializer(serializers.ModelSerializer):
             }
         }
 
-    def validate_confirmed_password(self, value):
-        password = self.initial_data.get('password')
-        if password and value and password != value:
-            raise serializers.ValidationError('Passwords do not match')
-        return value
+    def validate(self, attrs):
+        if attrs['password'] != attrs.pop('confirmed_password'):
+            raise serializers.ValidationError(
+                {'confirmed_password': 'Passwords do not match'})
+        return attrs
 
     def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError('Email already exists')
-        return value
+        return value.lower()
 
     def save(self):
-        pw = self.validated_data['password']
-
-        account = User(
-            email=self.validated_data['email'], username=self.validated_data['username'])
-        account.set_password(pw)
-        account.save()
+        try:
+            # Savepoint so a failed INSERT does not break an outer transaction.
+            with transaction.atomic():
+                account = User.objects.create_user(
+                    username=self.validated_data['username'],
+                    email=self.validated_data['email'],
+                    password=self.validated_data['password'],
+                )
+        except IntegrityError as exc:
+            constraint = _violated_constraint(exc)
+            if EMAIL_UNIQUE_INDEX in constraint:
+                raise serializers.ValidationError({'email': 'Email already exists'}) from exc
+            if 'username' in constraint:
+                raise serializers.ValidationError(
+                    {'username': 'A user with that username already exists.'}) from exc
+            raise
         return account
 
 
@@ -69,6 +90,8 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     Notes:
     - The parent validate() is responsible for authentication and raising any
         authentication errors; this class only enriches the successful response.
+    - self.user comes from auth_app.backends.LoginFieldsModelBackend, which loads
+        only the columns read here (plus password/is_active for the credential check).
     - Avoids exposing additional or sensitive user fields.
     """
 
@@ -1,17 +1,35 @@
 """Authentication views using JWT stored in HTTP-only cookies."""
 
+import logging
+
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 
 from .serializers import RegistrationSerializer, CustomTokenObtainPairSerializer
 
+logger = logging.getLogger(__name__)
+
+# Cookie attributes are fixed for the lifetime of the process, so resolve
+# settings.DEBUG once instead of on every login/refresh.
+_SECURE_COOKIE = not settings.DEBUG
+_COOKIE_KW = {'httponly': True, 'secure': _SECURE_COOKIE, 'samesite': 'Lax'}
+
+
+def _set_auth_cookie(response, key, value):
+    """Set an HttpOnly JWT cookie on response using the shared cookie attributes."""
+    response.set_cookie(key, str(value), **_COOKIE_KW)
+
 
 class RegistrationView(APIView):
     """Register a new user account.
@@ -99,25 +117,44 @@ class CookieTokenObtainPairView(TokenObtainPairView):
             "user": user
         }
 
-        response.set_cookie(
-            key='access_token',
-            value=str(access),
-            httponly=True,
-            secure=not settings.DEBUG,
-            samesite='Lax'
-        )
-
-        response.set_cookie(
-            key='refresh_token',
-            value=str(refresh),
-            httponly=True,
-            secure=not settings.DEBUG,
-            samesite='Lax'
-        )
+        _set_auth_cookie(response, 'access_token', access)
+        _set_auth_cookie(response, 'refresh_token', refresh)
 
         return response
 
 
+def blacklist_refresh_token(refresh_token, user):
+    """Blacklist a refresh token with two idempotent INSERTs instead of get_or_create.
+
+    RefreshToken.blacklist() looks up the user and runs get_or_create on both
+    OutstandingToken and BlacklistedToken (up to five queries). Here the
+    outstanding row is inserted with ON CONFLICT DO NOTHING (it usually exists
+    already from login), its id is read back, and the blacklist row is inserted
+    the same way. The owning user is taken from the authenticated request when
+    it matches the token's user claim, so no user SELECT is needed.
+    """
+    token = RefreshToken(refresh_token)
+    jti = token.payload[api_settings.JTI_CLAIM]
+    token_user_id = token.payload.get(api_settings.USER_ID_CLAIM)
+    owner_matches = str(getattr(user, api_settings.USER_ID_FIELD)) == str(token_user_id)
+
+    OutstandingToken.objects.bulk_create(
+        [OutstandingToken(
+            jti=jti,
+            token=refresh_token,
+            user=user if owner_matches else None,
+            created_at=token.current_time,
+            expires_at=datetime_from_epoch(token.payload['exp']),
+        )],
+        ignore_conflicts=True,
+    )
+    outstanding_id = OutstandingToken.objects.values_list('id', flat=True).get(jti=jti)
+    BlacklistedToken.objects.bulk_create(
+        [BlacklistedToken(token_id=outstanding_id)],
+        ignore_conflicts=True,
+    )
+
+
 class LogoutCookieView(APIView):
     """
     Class-based view that handles user logout by invalidating the refresh token (if present in cookies)
@@ -126,19 +163,19 @@ class LogoutCookieView(APIView):
     - Requires an authenticated user (permission_classes = [IsAuthenticated]).
     - On POST:
         - Reads the 'refresh_token' cookie from request.COOKIES.
-        - If a refresh token is present, attempts to blacklist it using RefreshToken(refresh_token).
-            Any exception raised during blacklisting is suppressed to ensure logout proceeds.
+        - If a refresh token is present, blacklists it via blacklist_refresh_token().
+            An invalid or expired token (TokenError) is logged and ignored so logout proceeds;
+            other errors (e.g. database failures) propagate to DRF's exception handler.
         - Constructs and returns a Response with HTTP 200 and a confirmation message.
         - Deletes the 'access_token' and 'refresh_token' cookies from the response.
     Side effects
-    - May add the provided refresh token to the JWT blacklist (requires Django REST framework SimpleJWT
-        blacklist app to be configured).
+    - Adds the provided refresh token to the SimpleJWT token blacklist.
     - Removes authentication cookies from the client by setting deletion headers in the response.
     Return
     - rest_framework.response.Response with status HTTP_200_OK and a JSON detail message.
     Notes
     - The view assumes JWTs are stored in cookies named 'access_token' and 'refresh_token'.
-    - If blacklisting is not enabled or the provided token is invalid/expired, the view will still clear cookies
+    - If the provided token is invalid/expired, the view will still clear cookies
         and return success to avoid leaving the client in an inconsistent authenticated state.
     """
     permission_classes = [IsAuthenticated]
@@ -148,10 +185,9 @@ class LogoutCookieView(APIView):
 
         if refresh_token:
             try:
-                token = RefreshToken(refresh_token)
-                token.blacklist()
-            except Exception:
-                pass
+                blacklist_refresh_token(refresh_token, request.user)
+            except TokenError as e:
+                logger.info('Refresh token not blacklisted on logout: %s', e)
 
         response = Response(
             {"detail": "Log-Out successfully! All Tokens will be deleted. Refresh token is now invalid."}, status=status.HTTP_200_OK)
@@ -160,30 +196,42 @@ class LogoutCookieView(APIView):
         return response
 
 
+def _build_refresh_response(access):
+    """Return the refresh endpoint's success response with the access token cookie set."""
+    response = Response({
+        "detail": "Token refreshed",
+        "access": access
+        })
+
+    _set_auth_cookie(response, 'access_token', access)
+
+    return response
+
+
 class CookieRefreshView(TokenRefreshView):
     """
     Refresh access token using a refresh token stored in an HTTP cookie.
     This view handles POST requests and attempts to refresh an access token by
-    reading the 'refresh_token' cookie from the incoming request. It delegates
-    validation and token generation to the underlying serializer obtained via
-    self.get_serializer(...).
+    reading the 'refresh_token' cookie from the incoming request. The token is
+    decoded directly with RefreshToken(...) instead of going through
+    TokenRefreshSerializer, which avoids building a serializer per refresh.
     Behavior:
     - If the 'refresh_token' cookie is missing, returns a 400 response with a
         descriptive error.
-    - If the serializer fails validation (invalid/expired refresh token), returns
-        a 401 response indicating an invalid refresh token.
+    - If the refresh token is invalid/expired (TokenError/InvalidToken), or its user no longer
+        passes USER_AUTHENTICATION_RULE (e.g. was deactivated), returns a 401
+        response indicating an invalid refresh token.
     - On success, returns a 200 response containing the new access token in the
         response body under the 'access' key and sets an HttpOnly 'access_token'
-        cookie with the same token.
+        cookie with the same token (built by _build_refresh_response).
     Side effects:
     - Sets an 'access_token' cookie with attributes:
         - httponly=True
         - secure=(not settings.DEBUG)
         - samesite='Lax'
     Notes:
-    - The serializer is invoked with data={'refresh': refresh_token}.
-    - The view is intended to be used with a JWT refresh serializer (e.g. from
-        django-rest-framework-simplejwt) that returns 'access' in validated_data.
+    - Refresh token rotation (ROTATE_REFRESH_TOKENS) is not performed here; only
+        a new access token is issued.
     """
 
     def post(self, request, *args, **kwargs):
@@ -195,29 +243,21 @@ class CookieRefreshView(TokenRefreshView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        serializer = self.get_serializer(data={'refresh': refresh_token})
-
         try:
-            serializer.is_valid(raise_exception=True)
-        except:
+            refresh = RefreshToken(refresh_token)
+        except (TokenError, InvalidToken):
             return Response(
                 {"detail": "Refresh token invalid!"},
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        access_token = serializer.validated_data.get('access')
-
-        response = Response({
-            "detail": "Token refreshed",
-            "access": access_token
-            })
-
-        response.set_cookie(
-            key='access_token',
-            value=access_token,
-            httponly=True,
-            secure=not settings.DEBUG,
-            samesite='Lax'
-        )
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = User.objects.only('id', 'is_active').filter(
+            **{api_settings.USER_ID_FIELD: user_id}).first()
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            return Response(
+                {"detail": "Refresh token invalid!"},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
 
-        return response
+        return _build_refresh_response(str(refresh.access_token))
@@ -1,6 +1,23 @@
 """Custom JWT authentication that also reads the access token from cookies."""
 
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# Validated access tokens are memoized for at most this many seconds (and never
+# past their own expiry), so repeat requests skip signature verification.
+TOKEN_CACHE_PREFIX = "jwt-auth:"
+TOKEN_CACHE_TIMEOUT = 60
+
+# Columns loaded for request.user; the password hash, timestamps and profile
+# fields are not needed by the API views.
+USER_FIELDS = ("id", "is_active", "username", "email")
 
 
 class CookieJWTAuthentication(JWTAuthentication):
@@ -19,7 +36,12 @@ class CookieJWTAuthentication(JWTAuthentication):
     - If no token is found at all, returns None so other authentication backends
         can run or the request is treated as unauthenticated.
     - If a raw token is found, it is validated with self.get_validated_token and
-        the corresponding user is retrieved with self.get_user.
+        the corresponding user is retrieved with self.get_user. The validated token
+        is cached under a BLAKE2b hash of the raw token for up to
+        TOKEN_CACHE_TIMEOUT seconds (bounded by the token's "exp"), so subsequent
+        requests with the same token skip decoding and signature verification.
+        The user is still loaded on every request, so deactivated users are
+        rejected immediately, but only the USER_FIELDS columns are selected.
     - On success returns a (user, validated_token) tuple. On invalid token cases
         the underlying validation methods will raise the appropriate authentication
         exceptions.
@@ -52,5 +74,64 @@ class CookieJWTAuthentication(JWTAuthentication):
         if raw_token is None:
             return None
 
-        validated_token = self.get_validated_token(raw_token)
+        validated_token = self.get_cached_validated_token(raw_token)
         return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        """Load the token's user with a narrow column projection.
+
+        Mirrors JWTAuthentication.get_user but restricts the SELECT to
+        USER_FIELDS (plus the password hash when CHECK_REVOKE_TOKEN needs it).
+        Other fields remain available as deferred attributes.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        fields = USER_FIELDS
+        if api_settings.CHECK_REVOKE_TOKEN:
+            fields += ("password",)
+
+        try:
+            user = self.user_model._default_manager.only(*fields).get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            ) from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+    def get_cached_validated_token(self, raw_token):
+        """Return the validated token for raw_token, using the cache when possible.
+
+        Validation only depends on the token itself (signature and expiry), so a
+        cached result stays correct until the token expires; the cache timeout
+        never exceeds the remaining lifetime.
+        """
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode()
+        key = TOKEN_CACHE_PREFIX + hashlib.blake2b(raw_token, digest_size=16).hexdigest()
+
+        validated_token = cache.get(key)
+        if validated_token is None:
+            validated_token = self.get_validated_token(raw_token)
+            timeout = min(TOKEN_CACHE_TIMEOUT, int(validated_token["exp"] - time.time()))
+            if timeout > 0:
+                cache.set(key, validated_token, timeout)
+        return validated_token
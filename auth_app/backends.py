@@ -0,0 +1,37 @@
+"""Authentication backend that loads only the columns needed to log a user in."""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+# Columns needed to verify credentials and build the login response
+# (id/username/email); everything else stays deferred.
+LOGIN_FIELDS = ("id", "username", "email", "password", "is_active")
+
+
+class LoginFieldsModelBackend(ModelBackend):
+    """ModelBackend variant whose credential lookup selects only LOGIN_FIELDS.
+
+    Behaves exactly like django.contrib.auth.backends.ModelBackend.authenticate,
+    including the dummy hash for unknown users, but avoids fetching the full
+    auth_user row (timestamps, names, flags) on every login. The password hash
+    is kept because check_password() needs it.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.only(*LOGIN_FIELDS).get(
+                **{UserModel.USERNAME_FIELD: username}
+            )
+        except UserModel.DoesNotExist:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user (#20760).
+            UserModel().set_password(password)
+        else:
+            if user.check_password(password) and self.user_can_authenticate(user):
+                return user
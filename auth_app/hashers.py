@@ -0,0 +1,22 @@
+"""Password hashers with an explicitly calibrated work factor."""
+
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id hasher with cost parameters pinned instead of inherited.
+
+    Django's stock Argon2 settings (100 MiB memory, parallelism 8) make each
+    set_password()/check_password() call in registration and login take a
+    large, host-dependent amount of time. The values below follow the OWASP
+    baseline for Argon2id (19 MiB, 2 iterations, 1 lane), which keeps a single
+    hash well below ~250 ms on typical server CPUs while remaining memory-hard.
+
+    The algorithm identifier is unchanged ("argon2"), so existing Argon2
+    hashes keep verifying and are transparently re-hashed with these
+    parameters on the next successful login.
+    """
+
+    time_cost = 2
+    memory_cost = 19456
+    parallelism = 1
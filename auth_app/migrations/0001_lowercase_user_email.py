@@ -0,0 +1,49 @@
+"""Normalize user emails to lowercase and enforce case-insensitive uniqueness.
+
+auth.User belongs to django.contrib.auth, so the constraint is added as a
+functional unique index on LOWER(email) via raw SQL. Blank emails (e.g. users
+created through createsuperuser without an address) are excluded.
+"""
+
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def lowercase_emails(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+
+    duplicates = list(
+        User.objects.exclude(email='')
+        .values(email_lower=Lower('email'))
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+        .values_list('email_lower', flat=True)
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Cannot enforce case-insensitive unique emails; these addresses are '
+            'used by more than one account and must be merged manually first: '
+            + ', '.join(sorted(duplicates))
+        )
+
+    for user in User.objects.exclude(email='').only('id', 'email'):
+        lowered = user.email.lower()
+        if lowered != user.email:
+            User.objects.filter(pk=user.pk).update(email=lowered)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX auth_user_email_lower_uniq "
+                "ON auth_user (LOWER(email)) WHERE email <> ''",
+            reverse_sql="DROP INDEX auth_user_email_lower_uniq",
+        ),
+    ]
@@ -1,9 +1,16 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.urls import reverse
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
 from django.contrib.auth.models import User
 
+from auth_app.api.serializers import RegistrationSerializer
+from auth_app.authentication import CookieJWTAuthentication
+
 
 class AuthApiTests(APITestCase):
     """
@@ -15,6 +22,14 @@ class AuthApiTests(APITestCase):
         valid credentials and that registering with a duplicate email returns
         HTTP 400 with an 'email' validation error.
 
+    - test_register_treats_email_case_insensitively:
+        Verifies that registration stores the email lowercased and rejects an
+        address that differs from an existing one only by letter case.
+
+    - test_register_reports_username_taken_after_validation:
+        Verifies that a username claimed between validation and save() is
+        reported as a 'username' error, not as a duplicate email.
+
     - test_login_sets_http_only_cookies:
         Verifies that a POST to /api/login/ with valid credentials returns HTTP 200,
         includes 'access_token' and 'refresh_token' cookies, and returns the
@@ -25,11 +40,30 @@ class AuthApiTests(APITestCase):
         clears the authentication cookies (access_token and refresh_token), i.e.
         the cookies are present but have empty values after logout.
 
+    - test_logout_blacklists_refresh_token_from_cookie:
+        Verifies that logging out with a 'refresh_token' cookie adds that token to
+        the blacklist and that it can no longer be used to refresh.
+
+    - test_logout_with_invalid_refresh_cookie_still_clears_cookies:
+        Verifies that an unparsable 'refresh_token' cookie does not prevent
+        logout from succeeding and clearing both cookies.
+
     - test_refresh_issues_new_access_token_from_cookie:
         Verifies that POSTing to /api/token/refresh/ using a valid refresh token
         stored in the client's 'refresh_token' cookie returns HTTP 200, includes
         a new access token in the response body, and sets an 'access_token' cookie.
+
+    - test_refresh_rejects_invalid_refresh_token:
+        Verifies that POSTing to /api/token/refresh/ with a malformed
+        'refresh_token' cookie returns HTTP 401 and sets no 'access_token' cookie.
+
+    - test_cookie_authentication_caches_validated_token:
+        Verifies that requests authenticated via the 'access_token' cookie succeed
+        and that the token is only decoded/verified once for repeated requests.
     """
+    def tearDown(self):
+        cache.clear()
+
     def test_register_creates_user_and_enforces_unique_email(self):
         payload = {
             "username": "alice",
@@ -48,6 +82,37 @@ class AuthApiTests(APITestCase):
         self.assertEqual(dup_response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("email", dup_response.data)
 
+    def test_register_treats_email_case_insensitively(self):
+        payload = {
+            "username": "erin",
+            "email": "Erin@Example.com",
+            "password": "secret123",
+            "confirmed_password": "secret123",
+        }
+
+        response = self.client.post("/api/register/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(User.objects.get(username="erin").email, "erin@example.com")
+
+        payload.update(username="erin2", email="ERIN@example.COM")
+        dup_response = self.client.post("/api/register/", payload, format="json")
+        self.assertEqual(dup_response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", dup_response.data)
+
+    def test_register_reports_username_taken_after_validation(self):
+        serializer = RegistrationSerializer(data={
+            "username": "bob",
+            "email": "bob@example.com",
+            "password": "secret123",
+            "confirmed_password": "secret123",
+        })
+        self.assertTrue(serializer.is_valid())
+        User.objects.create_user(username="bob", email="other@example.com", password="x")
+
+        with self.assertRaises(serializers.ValidationError) as ctx:
+            serializer.save()
+        self.assertEqual(list(ctx.exception.detail), ["username"])
+
     def test_login_sets_http_only_cookies(self):
         user = User.objects.create_user(
             username="bob", email="bob@example.com", password="secret123"
@@ -77,6 +142,35 @@ class AuthApiTests(APITestCase):
         self.assertEqual(response.cookies["access_token"].value, "")
         self.assertEqual(response.cookies["refresh_token"].value, "")
 
+    def test_logout_blacklists_refresh_token_from_cookie(self):
+        user = User.objects.create_user(
+            username="frank", email="frank@example.com", password="secret123"
+        )
+        refresh = RefreshToken.for_user(user)
+        self.client.force_authenticate(user)
+        self.client.cookies["refresh_token"] = str(refresh)
+
+        response = self.client.post("/api/logout/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            BlacklistedToken.objects.filter(token__jti=refresh["jti"]).exists()
+        )
+
+        self.client.cookies["refresh_token"] = str(refresh)
+        refresh_response = self.client.post("/api/token/refresh/")
+        self.assertEqual(refresh_response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_with_invalid_refresh_cookie_still_clears_cookies(self):
+        user = User.objects.create_user(
+            username="gina", email="gina@example.com", password="secret123"
+        )
+        self.client.force_authenticate(user)
+        self.client.cookies["refresh_token"] = "not-a-jwt"
+
+        response = self.client.post("/api/logout/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.cookies["refresh_token"].value, "")
+
     def test_refresh_issues_new_access_token_from_cookie(self):
         user = User.objects.create_user(
             username="dana", email="dana@example.com", password="secret123"
@@ -88,3 +182,29 @@ class AuthApiTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("access", response.data)
         self.assertIn("access_token", response.cookies)
+
+    def test_refresh_rejects_invalid_refresh_token(self):
+        self.client.cookies["refresh_token"] = "not-a-jwt"
+
+        response = self.client.post("/api/token/refresh/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertNotIn("access_token", response.cookies)
+
+    def test_cookie_authentication_caches_validated_token(self):
+        user = User.objects.create_user(
+            username="emma", email="emma@example.com", password="secret123"
+        )
+        self.client.cookies["access_token"] = str(RefreshToken.for_user(user).access_token)
+
+        with mock.patch.object(
+            CookieJWTAuthentication,
+            "get_validated_token",
+            autospec=True,
+            side_effect=CookieJWTAuthentication.get_validated_token,
+        ) as validate:
+            first = self.client.get("/api/quizzes/")
+            second = self.client.get("/api/quizzes/")
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(validate.call_count, 1)
@@ -0,0 +1,13 @@
+"""Celery application used to run long quiz-building jobs outside the web workers."""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+app = Celery('core')
+
+# All Celery options live in Django settings under the CELERY_ prefix.
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -1,10 +1,15 @@
 """Client utilities for generating quizzes via Google Gemini."""
 
+import hashlib
 import os
+from functools import lru_cache
 from pathlib import Path
 
-from dotenv import load_dotenv, dotenv_values
+from django.core.cache import cache
+from dotenv import load_dotenv
 from google import genai
+from google.genai import types
+from pydantic import BaseModel, Field
 
 # Prefer loading from the project .env.
 BASE_DIR = Path(__file__).resolve().parents[3]
@@ -13,12 +18,18 @@ load_dotenv(BASE_DIR / ".env")
 
 # The client gets the API key from the environment variable `GEMINI_API_KEY`.
 
+@lru_cache(maxsize=1)
 def get_client():
     """Create and return a configured genai.Client.
 
-    Reads the GEMINI_API_KEY from the .env file located at BASE_DIR / ".env" using dotenv_values.
-    If the environment variable is missing or empty, raises a RuntimeError with a clear message
-    instructing the user to add GEMINI_API_KEY to the .env file.
+    Reads GEMINI_API_KEY from the process environment, which load_dotenv populates from
+    BASE_DIR / ".env" once at import time; the .env file is not re-read here. If the key is
+    missing or empty, raises a RuntimeError with a clear message instructing the user to add
+    GEMINI_API_KEY to the .env file.
+
+    The client is built once per process and reused, so its HTTP connection pool survives
+    across generate_quiz() calls. A missing key is not cached (the RuntimeError is raised
+    again on the next call); use get_client.cache_clear() after changing the key at runtime.
 
     Returns:
       genai.Client: A genai client instance initialized with the retrieved API key.
@@ -26,7 +37,7 @@ def get_client():
     Raises:
       RuntimeError: If GEMINI_API_KEY is not set in the .env file.
     """
-    api_key = dotenv_values(BASE_DIR / ".env").get("GEMINI_API_KEY")
+    api_key = os.environ.get("GEMINI_API_KEY")
     if not api_key:
         raise RuntimeError(
             "GEMINI_API_KEY is not set. Add it to your .env file before calling generate_quiz()."
@@ -34,67 +45,79 @@ def get_client():
     return genai.Client(api_key=api_key)
 
 
-TEMPLATE = '''Based on the following transcript, generate a quiz in valid JSON format.
-
-The quiz must follow this exact structure:
-
-{{
-
-  "title": "Create a concise quiz title based on the topic of the transcript.",
-
-  "description": "Summarize the transcript in no more than 150 characters. Do not include any quiz questions or answers.",
-
-  "questions": [
+# Response schema for structured output; mirrors the QuizSerializer/QuestionSerializer
+# input. Docstrings and Field descriptions are sent to the model as the schema text.
+class QuestionSchema(BaseModel):
+    """One multiple-choice question."""
 
-    {{
+    question_title: str
+    question_options: list[str] = Field(description="Exactly 4 distinct answer options.")
+    answer: str = Field(description="The correct option, copied verbatim from question_options.")
 
-      "question_title": "The question goes here.",
 
-      "question_options": ["Option A", "Option B", "Option C", "Option D"],
+class QuizSchema(BaseModel):
+    """A quiz generated from a video transcript."""
 
-      "answer": "The correct answer from the above options"
+    title: str = Field(description="Concise quiz title based on the topic of the transcript.")
+    description: str = Field(
+        description="Summary of the transcript in at most 150 characters, without questions or answers."
+    )
+    questions: list[QuestionSchema] = Field(description="Exactly 10 questions.")
 
-    }},
 
-    ...
+# The JSON shape lives in QuizSchema, so the prompt only has to state the task.
+TEMPLATE = (
+    "Generate a quiz with exactly 10 multiple-choice questions from the following transcript. "
+    "Each question has exactly one correct answer.\n\nTranscript:\n"
+)
 
-    (exactly 10 questions)
+# Structured output: the model returns a bare JSON document conforming to QuizSchema.
+# A 10-question quiz is ~1.5k tokens; on 2.5 models thinking tokens count towards
+# max_output_tokens, so the thinking budget is capped as well to bound latency/cost
+# while leaving ample room for the JSON itself.
+GENERATION_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=QuizSchema,
+    max_output_tokens=8192,
+    thinking_config=types.ThinkingConfig(thinking_budget=1024),
+)
 
-  ]
+# Generated quizzes are cached by (model, prompt) so re-submitting a video whose
+# transcript was already processed skips the Gemini round trip.
+QUIZ_CACHE_PREFIX = "gemini-quiz:"
+QUIZ_CACHE_TIMEOUT = 7 * 24 * 3600
 
-}}
+DEFAULT_MODEL = "gemini-2.5-flash"
 
-Requirements:
 
-- Each question must have exactly 4 distinct answer options.
+def _quiz_cache_key(transcript, model):
+    """Build the cache key for a transcript/model pair.
 
-- Only one correct answer is allowed per question, and it must be present in 'question_options'.
-
-- The output must be valid JSON and parsable as-is (e.g., using Python's json.loads).
-
-- Do not include explanations, comments, or any text outside the JSON.
-
-- Transcript: 
-
-'''
+    TEMPLATE is part of the digest, so editing the prompt invalidates old entries.
+    """
+    digest = hashlib.sha256()
+    digest.update(TEMPLATE.encode())
+    digest.update(transcript.encode())
+    return f"{QUIZ_CACHE_PREFIX}{model}:{digest.hexdigest()}"
 
 
-def generate_quiz(transcript, model="gemini-2.5-flash"):
+def generate_quiz(transcript, model=DEFAULT_MODEL):
     """
     Generate a quiz from a transcript using a Gemini model.
 
     Parameters
     ----------
     transcript : str
-      The transcript text to use as source material. This text is appended to the module-level
-      TEMPLATE to form the prompt sent to the Gemini API.
+      The transcript text to use as source material. It is sent as a separate text part after
+      the module-level TEMPLATE, so the two strings are never concatenated in memory.
     model : str, optional
-      The identifier of the Gemini model to use (default: "gemini-2.5-flash").
+      The identifier of the Gemini model to use (default: DEFAULT_MODEL, "gemini-2.5-flash").
 
     Returns
     -------
     str
-      The textual quiz content produced by the Gemini API (taken from response.text).
+      The textual quiz content produced by the Gemini API (taken from response.text), or the
+      cached text from an earlier call with the same transcript and model.
 
     Raises
     ------
@@ -105,10 +128,36 @@ def generate_quiz(transcript, model="gemini-2.5-flash"):
     Notes
     -----
     - This function performs network I/O by calling get_client() and then client.models.generate_content.
-    - Prompt construction relies on a module-level TEMPLATE variable.
+    - The prompt is passed as contents=[TEMPLATE, transcript], which the SDK sends as one user
+      turn with two text parts.
+    - GENERATION_CONFIG requests structured output with QuizSchema as response_schema, so the
+      text is a bare JSON document in the quiz shape, without Markdown code fences or prose.
     - Errors from the underlying client (network errors, API errors) may propagate to the caller.
+    - Results are cached in Django's default cache for QUIZ_CACHE_TIMEOUT seconds, keyed by the
+      model and a SHA-256 of TEMPLATE + transcript; only exact transcript matches are hits.
+      Only responses that finished normally (finish_reason STOP) are cached, so an answer cut
+      off at max_output_tokens or stopped by a safety filter is not replayed. Callers that
+      reject the text later on should call discard_cached_quiz() with the same arguments.
     """
+    key = _quiz_cache_key(transcript, model)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
     client = get_client()
-    prompt = TEMPLATE + transcript
-    response = client.models.generate_content(model=model, contents=prompt)
-    return response.text
+    response = client.models.generate_content(
+        model=model,
+        contents=[TEMPLATE, transcript],
+        config=GENERATION_CONFIG,
+    )
+
+    text = response.text
+    candidates = response.candidates or []
+    if text and candidates and candidates[0].finish_reason == types.FinishReason.STOP:
+        cache.set(key, text, QUIZ_CACHE_TIMEOUT)
+    return text
+
+
+def discard_cached_quiz(transcript, model=DEFAULT_MODEL):
+    """Drop the cached quiz for a transcript/model pair, e.g. after it failed validation."""
+    cache.delete(_quiz_cache_key(transcript, model))
@@ -0,0 +1,23 @@
+"""Project-level middleware."""
+
+from .views import health_check
+
+HEALTH_CHECK_PATH = "/health/"
+
+
+class HealthCheckMiddleware:
+    """
+    Answer liveness probes on HEALTH_CHECK_PATH before the rest of the stack runs.
+
+    Must be first in MIDDLEWARE: the probe response is returned without going
+    through sessions, authentication, CSRF, CORS or host validation, and no
+    database connection is opened. The /health/ URL route stays as a fallback.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path_info == HEALTH_CHECK_PATH:
+            return health_check(request)
+        return self.get_response(request)
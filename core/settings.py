@@ -68,12 +68,15 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     'auth_app',
     'quiz_app'
 ]
 
 MIDDLEWARE = [
+    # Answers /health/ directly; keep first so probes skip the rest of the chain.
+    'core.middleware.HealthCheckMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -137,6 +140,20 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Same as ModelBackend, but the login lookup only selects the columns it needs.
+AUTHENTICATION_BACKENDS = [
+    'auth_app.backends.LoginFieldsModelBackend',
+]
+
+# Argon2 with an explicit work factor (see auth_app/hashers.py); the PBKDF2
+# hashers stay listed so passwords hashed before the switch still verify and
+# get upgraded on the next login.
+PASSWORD_HASHERS = [
+    'auth_app.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -176,7 +193,17 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'auth_app.authentication.CookieJWTAuthentication',
-    )
+    ),
+    # orjson instead of the stdlib json module for API request/response bodies.
+    'DEFAULT_RENDERER_CLASSES': (
+        'drf_orjson_renderer.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'drf_orjson_renderer.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -184,6 +211,27 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1)
 }
 
+# Cache: shared Redis cache when DJANGO_CACHE_URL is set, so cached JWT
+# validations, transcripts and Gemini quizzes are reused across web and worker
+# processes; per-process local memory otherwise.
+CACHE_URL = _env_str('DJANGO_CACHE_URL')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+
+# Celery (background quiz generation)
+CELERY_BROKER_URL = _env_str('CELERY_BROKER_URL', 'redis://redis:6379/0')
+# Every prefork child loads its own whisper model, and faster-whisper runs it on
+# WHISPER_CPU_THREADS threads, so by default the cores are split between children
+# instead of each one starting a thread per core.
+CELERY_WORKER_CONCURRENCY = int(_env_str('CELERY_WORKER_CONCURRENCY', '1'))
+WHISPER_CPU_THREADS = int(_env_str('WHISPER_CPU_THREADS', '0')) or max(
+    1, (os.cpu_count() or 1) // CELERY_WORKER_CONCURRENCY)
+
 if 'corsheaders' in INSTALLED_APPS:
     CORS_ALLOWED_ORIGINS = _env_list('DJANGO_CORS_ALLOWED_ORIGINS', [])
 
@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase, override_settings
+
+
+@override_settings(ALLOWED_HOSTS=["quizly.example.tld"])
+class HealthCheckMiddlewareTests(SimpleTestCase):
+    """
+    Tests for HealthCheckMiddleware, which answers /health/ ahead of the middleware stack.
+
+    SimpleTestCase fails any test that queries the database, so these also assert that
+    the probe opens no connection.
+
+    - test_health_check_skips_host_validation_and_middleware:
+        - GETs /health/ with a Host header outside ALLOWED_HOSTS and asserts a 200 with
+          {"status": "ok"}, and no X-Frame-Options header (the rest of the chain did not run).
+    - test_other_paths_use_the_full_middleware_chain:
+        - Asserts another path with the same Host is rejected with 400 by host validation,
+          and that an allowed Host gets the headers added by the later middleware.
+    """
+
+    def test_health_check_skips_host_validation_and_middleware(self):
+        response = self.client.get("/health/", HTTP_HOST="10.0.0.7:8000")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+        self.assertNotIn("X-Frame-Options", response.headers)
+
+    def test_other_paths_use_the_full_middleware_chain(self):
+        with self.assertLogs("django.security.DisallowedHost", "ERROR"):
+            response = self.client.get("/api/quizzes/", HTTP_HOST="10.0.0.7:8000")
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get("/api/quizzes/", HTTP_HOST="quizly.example.tld")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.headers["X-Frame-Options"], "DENY")
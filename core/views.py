@@ -2,4 +2,5 @@ from django.http import JsonResponse
 
 
 def health_check(_request):
+    """Liveness probe; served by HealthCheckMiddleware ahead of the middleware stack."""
     return JsonResponse({"status": "ok"})
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Quiz
+from .models import Quiz, QuizJob
 
 
 class QuizAdmin(admin.ModelAdmin):
@@ -7,4 +7,10 @@ class QuizAdmin(admin.ModelAdmin):
     list_filter = ['user']
 
 
-admin.site.register(Quiz, QuizAdmin)
\ No newline at end of file
+class QuizJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'video_url', 'user', 'status', 'created_at']
+    list_filter = ['status']
+
+
+admin.site.register(Quiz, QuizAdmin)
+admin.site.register(QuizJob, QuizJobAdmin)
\ No newline at end of file
@@ -7,7 +7,8 @@ class IsQuizOwner(BasePermission):
     """
     Allows access only if the logged-in user is the owner of the quiz.
     Expects the view to return a quiz object via get_object().
+    Compares the foreign key column, so the owner's auth_user row is not loaded.
     """
 
     def has_object_permission(self, request, view, obj):
-        return obj.user == request.user
+        return obj.user_id == request.user.pk
@@ -1,7 +1,39 @@
 """Serializers for quiz API: URL validation, question structure, and quiz CRUD."""
+from django.db import transaction
 from rest_framework import serializers
 from quiz_app.models import Quiz, Question
-from quiz_app.services.utils import YOUTUBE_URL_VALIDATOR
+from quiz_app.services.utils import validate_youtube_url
+
+
+class YouTubeURLField(serializers.CharField):
+    """
+    CharField for YouTube video URLs, checked only with validate_youtube_url.
+    Replaces URLField so Django's generic URLValidator regex does not run on top
+    of the YouTube check. max_length follows Quiz.video_url. Scheme-less input
+    such as "youtu.be/<id>" is stored with an https:// prefix so the saved value
+    is still a full URL.
+    """
+    default_validators = [validate_youtube_url]
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("max_length", Quiz._meta.get_field("video_url").max_length)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        if "://" not in value:
+            value = "https://" + value
+        return value
+
+
+class UrlInputSerializer(serializers.Serializer):
+    """
+    Validate the YouTube URL sent by the frontend to request a new quiz.
+    Exposes a single required `url` field (YouTubeURLField). Used
+    instead of a partial QuizSerializer so the nested question fields are not built
+    just to validate one URL.
+    """
+    url = YouTubeURLField()
 
 
 class QuestionSerializer(serializers.ModelSerializer):
@@ -20,9 +52,9 @@ class QuestionSerializer(serializers.ModelSerializer):
     - Validation is performed in the object-level validate(attrs) method.
     Raises:
     - serializers.ValidationError: if question_options does not contain exactly four items
-        (message: "A question must have exactly 4 options.").
-    - serializers.ValidationError: if answer is not one of the provided options
-        (message: "The answer must be one of the options.").
+        or answer is not one of them (message: "A question must have exactly 4 options and
+        the answer must be one of them."). Both conditions are tested in one short-circuit
+        check, so the membership scan only runs for correctly sized option lists.
     Returns:
     - The validated attrs dict (unchanged) when validation passes.
     """
@@ -39,15 +71,10 @@ class QuestionSerializer(serializers.ModelSerializer):
 
     def validate(self, attrs):
         options = attrs.get("question_options", [])
-        answer = attrs.get("answer")
-
-        if len(options) != 4:
-            raise serializers.ValidationError(
-                "A question must have exactly 4 options.")
 
-        if answer not in options:
+        if len(options) != 4 or attrs.get("answer") not in options:
             raise serializers.ValidationError(
-                "The answer must be one of the options.")
+                "A question must have exactly 4 options and the answer must be one of them.")
 
         return attrs
 
@@ -65,10 +92,10 @@ class QuizSerializer(serializers.ModelSerializer):
         serializer context (self.context.get("user")).
     - video_url: The model field that is exposed for read operations and included in the
         serializer's output fields.
-    - url: A write-only URLField accepted from the frontend. It is mapped to the model
+    - url: A write-only YouTubeURLField accepted from the frontend. It is mapped to the model
         field video_url using source="video_url". Because it is write_only, it will be
         accepted on input but not emitted in serialized output. The field is validated
-        using YOUTUBE_URL_VALIDATOR.
+        using validate_youtube_url (the same validator as Quiz.video_url).
     Meta:
     - The serializer is a ModelSerializer for the Quiz model and enumerates the explicit
         fields it includes in input/output: id, title, description, video_url, url,
@@ -80,8 +107,9 @@ class QuizSerializer(serializers.ModelSerializer):
     - Retrieves the creating user from self.context.get("user") and creates the Quiz
         instance with the remaining validated_data (including a video_url if provided via
         the write-only url field).
-    - Iterates the questions_data and creates Question objects associated with the
-        created Quiz instance via Question.objects.create(quiz=quiz, **q).
+    - Inserts all Question objects for the created Quiz with a single
+        Question.objects.bulk_create(...) call; the Quiz and its questions are written in
+        one transaction.
     - Returns the newly created Quiz instance.
     Notes and caveats:
     - Nested updates are not implemented: create() handles only creation; update()
@@ -96,12 +124,7 @@ class QuizSerializer(serializers.ModelSerializer):
     questions = QuestionSerializer(many=True)
     user = serializers.PrimaryKeyRelatedField(read_only=True)
     # Accept frontend field name `url` but map it to model field `video_url`.
-    url = serializers.URLField(
-        write_only=True,
-        required=False,
-        source="video_url",
-        validators=[YOUTUBE_URL_VALIDATOR],
-    )
+    url = YouTubeURLField(write_only=True, required=False, source="video_url")
 
     class Meta:
         model = Quiz
@@ -117,12 +140,26 @@ class QuizSerializer(serializers.ModelSerializer):
             "user",
         ]
 
+    @transaction.atomic
     def create(self, validated_data):
         questions_data = validated_data.pop("questions")
         user = self.context.get("user")
         quiz = Quiz.objects.create(user=user, **validated_data)
 
-        for q in questions_data:
-            Question.objects.create(quiz=quiz, **q)
+        Question.objects.bulk_create(
+            [Question(quiz=quiz, **q) for q in questions_data], batch_size=50)
 
         return quiz
+
+
+class QuizListSerializer(serializers.ModelSerializer):
+    """
+    Lightweight read-only representation of a Quiz for list views.
+    Exposes only id, title, video_url and created_at; nested questions and the
+    description are left to the detail endpoint (QuizSerializer). Meta.fields
+    doubles as the column list for .only() on the list queryset.
+    """
+    class Meta:
+        model = Quiz
+        fields = ["id", "title", "video_url", "created_at"]
+        read_only_fields = fields
@@ -5,6 +5,7 @@ from . import views
 
 urlpatterns = [
     path('createQuiz/', views.QuizCreateAPIView.as_view(), name='quiz-create'),
+    path('jobs/<uuid:job_id>/', views.QuizJobStatusAPIView.as_view(), name='quiz-job-status'),
     path('quizzes/', views.QuizListAPIView.as_view(), name='quiz-list'),
     path('quizzes/<int:pk>/', views.QuizDetailView.as_view(), name='quiz-detail')
 ]
@@ -1,80 +1,127 @@
 """API views for creating, listing, retrieving, updating, and deleting quizzes."""
 
+from datetime import timedelta
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 
-from .serializers import QuizSerializer
+from .serializers import QuizListSerializer, QuizSerializer, UrlInputSerializer
 from .permissions import IsQuizOwner
 
-from quiz_app.models import Quiz
-from quiz_app.services.quiz_builder import build_quiz_from_youtube
+from quiz_app.models import Quiz, QuizJob
+from quiz_app.tasks import BUILD_QUIZ_QUEUE_TIMEOUT, BUILD_QUIZ_TIME_LIMIT, build_quiz_task
+
+# Age (since the last status change) after which an unfinished job is considered lost.
+STALE_JOB_AFTER = {
+    QuizJob.Status.PENDING: timedelta(seconds=BUILD_QUIZ_QUEUE_TIMEOUT + BUILD_QUIZ_TIME_LIMIT),
+    QuizJob.Status.STARTED: timedelta(seconds=BUILD_QUIZ_TIME_LIMIT),
+}
 
 
 class QuizCreateAPIView(APIView):
     """
-    Create a Quiz from a YouTube URL by downloading the video, transcribing it, and generating quiz content.
+    Start building a Quiz from a YouTube URL in the background.
     Expected behavior:
     - Authentication: Requires an authenticated user (permission_classes = [IsAuthenticated]).
-    - Input: Expects a POST body containing 'url' (the frontend field), which is mapped to 'video_url' by the initial serializer.
-    - Validation: Validates the provided URL using QuizSerializer (context includes the requesting user; initial validation is partial to accept just the URL).
-    - Generation: Calls build_quiz_from_youtube(url) to perform video download, transcription, and automatic quiz generation; the returned dict is augmented with 'video_url'.
-    - Persistence: Validates the generated quiz payload with QuizSerializer (with user context) and saves a Quiz instance.
-    - Response: On success returns the serialized Quiz and HTTP 201 Created.
+    - Input: Expects a POST body containing 'url' (the frontend field).
+    - Validation: Validates the provided URL using UrlInputSerializer.
+    - Generation: Creates a QuizJob for the user and URL and enqueues build_quiz_task(job.id) on
+      Celery, which downloads, transcribes, generates and saves the quiz outside the web worker.
+    - Response: Returns HTTP 202 Accepted with {"job_id": ...} (the QuizJob UUID); poll
+      QuizJobStatusAPIView for the result.
     Error handling:
-    - Raises/returns HTTP 400 with a validation error detail when serializer/model validation fails (ValidationError).
-    - Returns HTTP 500 with a generic error message for unexpected exceptions.
+    - Returns HTTP 400 with a validation error detail when the URL is invalid.
+    - If the task cannot be enqueued (e.g. the broker is down) the job is marked FAILURE
+      and the error propagates as HTTP 500.
+    - Failures during generation are reported by the job status endpoint.
     """
     permission_classes = [IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
-        # Frontend sends `url`; serializer maps it to `video_url`.
-        serializer = QuizSerializer(
-            data={"url": request.data.get("url")},
-            context={"user": request.user},
-            partial=True,
-        )
+        serializer = UrlInputSerializer(data={"url": request.data.get("url")})
         serializer.is_valid(raise_exception=True)
-        url = serializer.validated_data["video_url"]
+        url = serializer.validated_data["url"]
 
+        job = QuizJob.objects.create(user=request.user, video_url=url)
         try:
-            quiz_dict = build_quiz_from_youtube(url)
-            quiz_dict["video_url"] = url
+            build_quiz_task.delay(str(job.id))
+        except Exception:
+            # No worker will ever see this job, so don't leave it PENDING.
+            QuizJob.objects.filter(pk=job.pk).update(
+                status=QuizJob.Status.FAILURE, updated_at=timezone.now())
+            raise
+        return Response({"job_id": str(job.id)}, status=status.HTTP_202_ACCEPTED)
 
-            serializer = QuizSerializer(
-                data=quiz_dict, context={"user": request.user})
-            serializer.is_valid(raise_exception=True)
-            quiz = serializer.save()
 
-            return Response(QuizSerializer(quiz).data, status=status.HTTP_201_CREATED)
+class QuizJobStatusAPIView(APIView):
+    """
+    Report the state of a quiz-building job started by QuizCreateAPIView.
+    Behavior:
+    - Authentication: Requires an authenticated user.
+    - GET returns {"job_id", "status"} where status is the QuizJob status
+      (PENDING, STARTED, SUCCESS, FAILURE).
+    - Jobs are looked up among the requesting user's own jobs; unknown ids and other
+      users' jobs return HTTP 404.
+    - On SUCCESS the created quiz is included under "quiz" (serialized with QuizSerializer),
+      unless it has been deleted since.
+    - On FAILURE a generic "detail" message is included; the underlying error is not exposed.
+    - Unfinished jobs older than STALE_JOB_AFTER are stored and reported as FAILURE: a job
+      STARTED more than BUILD_QUIZ_TIME_LIMIT ago lost its worker (hard time limit, OOM
+      killer), and one PENDING for longer than the queue timeout plus that limit lost its
+      message. build_quiz_task skips a job that is no longer PENDING when it starts.
+    """
+    permission_classes = [IsAuthenticated]
 
-        except ValidationError as e:
-            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception:
-            return Response({"detail": "Internal Server Error."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    def get(self, request, job_id, *args, **kwargs):
+        job = QuizJob.objects.filter(pk=job_id, user=request.user).only(
+            "id", "status", "quiz_id", "updated_at").first()
+        if job is None:
+            raise NotFound()
+
+        now = timezone.now()
+        stale_after = STALE_JOB_AFTER.get(job.status)
+        if stale_after is not None and now - job.updated_at > stale_after:
+            QuizJob.objects.filter(pk=job.pk, status=job.status).update(
+                status=QuizJob.Status.FAILURE, updated_at=now)
+            job.status = QuizJob.Status.FAILURE
+        data = {"job_id": str(job.id), "status": job.status}
+
+        if job.status == QuizJob.Status.SUCCESS and job.quiz_id is not None:
+            quiz = (Quiz.objects.defer("transcript_zstd")
+                    .prefetch_related("questions").get(pk=job.quiz_id))
+            data["quiz"] = QuizSerializer(quiz).data
+        elif job.status == QuizJob.Status.FAILURE:
+            data["detail"] = "Quiz generation failed."
+
+        return Response(data, status=status.HTTP_200_OK)
 
 
 class QuizListAPIView(APIView):
     """List quizzes belonging to the authenticated user.
     Handles GET requests and returns a serialized list of Quiz objects
     owned by the requesting user. The queryset is limited to quizzes
-    where Quiz.user == request.user, prefetches related 'questions' to
-    minimize additional database queries, and is ordered by newest first
-    ('-created_at').
+    where Quiz.user == request.user, selects only the columns rendered by
+    QuizListSerializer (questions are not loaded), and is ordered by newest
+    first ('-created_at').
     Authentication and permissions:
     - Requires authentication (IsAuthenticated). Anonymous users will be denied.
     Response:
-    - On success returns HTTP 200 with serializer data produced by QuizSerializer(many=True).
-        The exact fields and nested question representation are defined by QuizSerializer.
+    - On success returns HTTP 200 with serializer data produced by QuizListSerializer(many=True):
+        id, title, video_url and created_at per quiz. Use the detail endpoint for questions.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        quizzes = Quiz.objects.filter(user=request.user).prefetch_related(
-            'questions').order_by('-created_at')
-        serializer = QuizSerializer(quizzes, many=True)
+        quizzes = Quiz.objects.filter(user=request.user).only(
+            *QuizListSerializer.Meta.fields).order_by('-created_at')
+        serializer = QuizListSerializer(quizzes, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -92,16 +139,64 @@ class QuizDetailView(generics.RetrieveUpdateDestroyAPIView):
     - Deletions delegate to the generic destroy() implementation and will return the standard DRF response (typically 204 No Content) on success.
     - If the requested object does not exist or the user lacks permission, DRF will raise the appropriate errors (Http404 or PermissionDenied) before the handler code is executed.
     Attributes:
-        queryset (QuerySet): Quiz.objects.all()
+        queryset (QuerySet): Quiz.objects.defer("transcript_zstd")
         serializer_class (Serializer): QuizSerializer
         permission_classes (list): [IsAuthenticated, IsQuizOwner]
+    - GET sends ETag/Last-Modified validators (see get_cache_validators) with
+      "Cache-Control: private, no-cache"; a matching If-None-Match/If-Modified-Since
+      gets 304 Not Modified without loading the quiz or its questions.
     Notes:
     - PUT (full update) is supported by the base class but is not overridden here.
     """
-    queryset = Quiz.objects.all()
+    # The compressed transcript is not part of the API representation.
+    queryset = Quiz.objects.defer("transcript_zstd")
     serializer_class = QuizSerializer
     permission_classes = [IsAuthenticated, IsQuizOwner]
 
+    def get_cache_validators(self):
+        """
+        Return (etag, last_modified) for the requested quiz, or None.
+        Uses one aggregate query over the quiz row and its questions: last_modified is
+        the newest updated_at (epoch seconds) and the ETag also covers the question
+        count, so deleting a question changes it too. The lookup is restricted to the
+        requesting user's quizzes, so other users never get a 304 and still fall
+        through to get_object()'s 404/403.
+        """
+        row = (
+            Quiz.objects.filter(pk=self.kwargs["pk"], user=self.request.user)
+            .annotate(
+                questions_updated=Max("questions__updated_at"),
+                questions_count=Count("questions"),
+            )
+            .values_list("updated_at", "questions_updated", "questions_count")
+            .first()
+        )
+        if row is None:
+            return None
+        updated_at, questions_updated, questions_count = row
+        if questions_updated is not None:
+            updated_at = max(updated_at, questions_updated)
+        stamp = updated_at.timestamp()
+        etag = f'"{self.kwargs["pk"]}-{questions_count}-{int(stamp * 1_000_000)}"'
+        return etag, int(stamp)
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_cache_validators()
+        if validators is not None:
+            etag, last_modified = validators
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                not_modified.headers["ETag"] = etag
+                return not_modified
+
+        response = self.retrieve(request, *args, **kwargs)
+        if validators is not None:
+            response.headers["ETag"] = etag
+            response.headers["Last-Modified"] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
     def delete(self, request, *args, **kwargs):
         return self.destroy(request, *args, **kwargs)
 
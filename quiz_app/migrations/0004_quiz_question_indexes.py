@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-14 08:44
+
+import django.core.validators
+import re
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0003_alter_quiz_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='quiz',
+            name='video_url',
+            field=models.URLField(validators=[django.core.validators.RegexValidator(code='invalid_youtube_url', message='Invalid YouTube-URL.', regex=re.compile('^(https?://)?(www\\.)?(youtube\\.com/(watch\\?v=|shorts/)|youtu\\.be/)(?P<id>[\\w-]{11})([&?].*)?$', 2))]),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['quiz', 'id'], name='question_quiz_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['user', '-created_at'], name='quiz_user_created_idx'),
+        ),
+    ]
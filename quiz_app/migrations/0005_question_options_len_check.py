@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-14 08:50
+
+import django.db.models.lookups
+import quiz_app.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0004_quiz_question_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='question',
+            constraint=models.CheckConstraint(condition=django.db.models.lookups.Exact(quiz_app.models.JSONArrayLength('question_options'), 4), name='question_options_len_4'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-14 08:55
+
+import django.core.validators
+import re
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0005_question_options_len_check'),
+    ]
+
+    # Regex flags are spelled out by hand: the migration writer serializes
+    # re.ASCII patterns with re.UNICODE added, which re.compile() rejects.
+    operations = [
+        migrations.AlterField(
+            model_name='quiz',
+            name='video_url',
+            field=models.URLField(validators=[django.core.validators.RegexValidator(code='invalid_youtube_url', message='Invalid YouTube-URL.', regex=re.compile('\\A(?:https?://)?(?:www\\.)?(?:youtube\\.com/(?:watch\\?v=|shorts/)|youtu\\.be/)(?P<id>[\\w-]{11})(?:[?&#].*)?\\Z', re.IGNORECASE | re.ASCII))]),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-14 08:56
+
+import quiz_app.services.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0006_anchor_youtube_regex'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='quiz',
+            name='video_url',
+            field=models.URLField(validators=[quiz_app.services.utils.validate_youtube_url]),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-14 09:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0008_quizjob'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='quiz',
+            options={'ordering': ['-created_at']},
+        ),
+    ]
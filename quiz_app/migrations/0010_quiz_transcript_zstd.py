@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-14 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0009_quiz_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='transcript_zstd',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
@@ -1,9 +1,13 @@
-"""Database models for quizzes and their questions."""
+"""Database models for quizzes, their questions and quiz-building jobs."""
 
+import uuid
+
+import zstandard
 from django.db import models
+from django.db.models.lookups import Exact
 from django.conf import settings
 
-from quiz_app.services.utils import YOUTUBE_URL_VALIDATOR
+from quiz_app.services.utils import validate_youtube_url
 
 
 class Quiz(models.Model):
@@ -16,18 +20,21 @@ class Quiz(models.Model):
     Fields
     - title (str): Short, required title for the quiz (max length 255).
     - description (str): Longer textual description or summary of the quiz.
-    - video_url (str): Source video URL; validated by YOUTUBE_URL_VALIDATOR to
+    - video_url (str): Source video URL; validated by validate_youtube_url to
         ensure it points to an allowed YouTube resource.
     - user (ForeignKey): Reference to the owning user (settings.AUTH_USER_MODEL),
         with related_name="quizzes". Deleting the user cascades and removes their
         quizzes.
+    - transcript_zstd (bytes|None): The source transcript, zstd-compressed. Read and
+        write it through the `transcript` property; None for quizzes created before
+        transcripts were stored.
     - created_at (datetime): Auto-set timestamp when the quiz is created.
     - updated_at (datetime): Auto-updated timestamp when the quiz is modified.
     """
 
     title = models.CharField(max_length=255)
     description = models.TextField()
-    video_url = models.URLField(validators=[YOUTUBE_URL_VALIDATOR])
+    video_url = models.URLField(validators=[validate_youtube_url])
 
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -35,9 +42,44 @@ class Quiz(models.Model):
         on_delete=models.CASCADE,
     )
 
+    transcript_zstd = models.BinaryField(null=True, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Newest first; matches quiz_user_created_idx so per-user queries need no sort.
+        ordering = ["-created_at"]
+        indexes = [
+            # Serves the per-user list query (filter by user, newest first).
+            models.Index(fields=["user", "-created_at"], name="quiz_user_created_idx"),
+        ]
+
+    @property
+    def transcript(self):
+        """The source transcript as text (decompressed on access), or None."""
+        if self.transcript_zstd is None:
+            return None
+        return zstandard.ZstdDecompressor().decompress(bytes(self.transcript_zstd)).decode()
+
+    @transcript.setter
+    def transcript(self, value):
+        self.transcript_zstd = (
+            None if value is None
+            else zstandard.ZstdCompressor(level=10).compress(value.encode())
+        )
+
+
+class JSONArrayLength(models.Func):
+    """Number of elements in a JSON array column (jsonb_array_length on PostgreSQL)."""
+
+    function = "jsonb_array_length"
+    output_field = models.IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, function="json_array_length", **extra_context)
+
 
 class Question(models.Model):
     """
@@ -46,7 +88,8 @@ class Question(models.Model):
     Fields:
     - quiz (Quiz): ForeignKey to the Quiz this question is part of.
     - question_title (str): The text/title of the question.
-    - question_options (list|dict): JSON-serializable collection of possible answers; commonly a list of option strings or a dict mapping keys to option strings.
+    - question_options (list): JSON array of exactly four option strings; the length is
+        enforced by the question_options_len_4 check constraint.
     - answer (str): The correct answer; expected to correspond to one of the values (or keys, depending on representation) in question_options.
     - created_at (datetime): Timestamp when the question was created (auto-set).
     - updated_at (datetime): Timestamp when the question was last updated (auto-set).
@@ -65,5 +108,69 @@ class Question(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Lets the questions prefetch (quiz_id IN (...)) read rows in id order.
+            models.Index(fields=["quiz", "id"], name="question_quiz_id_idx"),
+        ]
+        constraints = [
+            # Mirrors QuestionSerializer.validate so rows written outside the API
+            # (admin, shell, future bulk imports) can't break the 4-option shape.
+            models.CheckConstraint(
+                condition=Exact(JSONArrayLength("question_options"), 4),
+                name="question_options_len_4",
+            ),
+        ]
+
     def __str__(self):
         return self.question_title
+
+
+class QuizJob(models.Model):
+    """
+    Tracks one background run of the YouTube-to-quiz pipeline.
+
+    Created by the create-quiz endpoint before build_quiz_task is enqueued; the
+    task moves it through the statuses and links the resulting quiz. The job status
+    endpoint reads this row, so ownership and state live in the database; Celery
+    stores no task results.
+
+    Fields:
+    - id (UUID): Primary key, returned to the client as job_id.
+    - user (ForeignKey): Owner of the job and of the quiz it produces.
+    - video_url (str): The validated YouTube URL to build the quiz from.
+    - status (str): One of Status (PENDING, STARTED, SUCCESS, FAILURE).
+    - quiz (ForeignKey|None): The created quiz once status is SUCCESS; set to NULL
+        if that quiz is deleted later.
+    - created_at / updated_at (datetime): Auto-managed timestamps; status changes made
+        with QuerySet.update() set updated_at explicitly.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING"
+        STARTED = "STARTED"
+        SUCCESS = "SUCCESS"
+        FAILURE = "FAILURE"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="quiz_jobs",
+        on_delete=models.CASCADE,
+    )
+    video_url = models.URLField(validators=[validate_youtube_url])
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING)
+    quiz = models.ForeignKey(
+        Quiz,
+        related_name="jobs",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.id} ({self.status})"
@@ -1,78 +1,73 @@
-"""Helpers to download YouTube audio to a temp file for quiz generation."""
+"""Helpers to fetch YouTube audio as 16 kHz mono PCM for quiz generation."""
 
-import os
-import tempfile
-import yt_dlp
+import subprocess
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    import numpy as np
 
-def download_audio_to_temp(url: str, preferred_codec: str = 'm4a'):
+SAMPLE_RATE = 16000
+
+
+def stream_audio_pcm(url: str, sample_rate: int = SAMPLE_RATE) -> "np.ndarray":
     """
-    This function uses yt_dlp to fetch the best available audio stream from a given
-    YouTube URL (or any URL supported by yt_dlp) and runs FFmpegExtractAudio to
-    convert/extract the audio into a standalone file.
+    Decode the audio track of a YouTube URL straight into a float32 PCM array.
+    yt_dlp only resolves the direct media URL of the best audio stream; FFmpeg then
+    reads that stream and writes mono 16-bit PCM at sample_rate to stdout, which is
+    converted to the float32 array in [-1, 1) that whisper/faster-whisper accept as
+    input. Nothing is written to disk and the audio is decoded only once.
     Args:
         url (str): YouTube video URL or any yt_dlp-compatible media identifier.
-        preferred_codec (str, optional): Desired audio codec/extension to produce
-            (for example 'm4a', 'mp3'). Default is 'm4a'. yt_dlp/FFmpeg will be
-            instructed to produce this codec, but the actual produced extension may
-            differ depending on available formats and FFmpeg behavior.
+        sample_rate (int, optional): Output sample rate in Hz. Default is 16000,
+            the rate both whisper backends expect.
     Returns:
-        str: Absolute path to the temporary audio file created (including extension).
-             The file is created with a unique base name in the system temporary
-             directory and will have an audio file extension appended by yt_dlp/FFmpeg.
+        numpy.ndarray: 1-D float32 array of audio samples.
     Raises:
-        FileNotFoundError: If yt_dlp does not produce any audio file for the given URL.
-        OSError: If temporary file creation/removal or other filesystem operations fail.
+        yt_dlp.utils.DownloadError: If yt_dlp cannot resolve the video.
+        RuntimeError: If FFmpeg fails or decodes no audio.
     Side effects and behavior notes:
-        - A unique temporary base filename is created and removed so that yt_dlp
-          can create the final file with the expected extension.
-        - The function configures yt_dlp to download 'bestaudio/best', be quiet,
-          and to avoid playlist downloads. It uses the FFmpegExtractAudio
-          postprocessor to request conversion to `preferred_codec`.
-        - If the file with the preferred extension is not found after download,
-          the function probes a list of common audio extensions ('m4a', 'mp3',
-          'wav', 'aac', 'ogg', 'flac') and returns the first match.
-        - The caller is responsible for deleting the returned temporary file when
-          it is no longer needed to avoid accumulating temporary files.
+        - yt_dlp is configured with 'bestaudio/best', quiet output and no playlist
+          expansion. FFmpeg ignores any video/subtitle/data tracks (-vn -sn -dn)
+          and decodes the audio once; there is no intermediate re-encode.
+        - The HTTP headers yt_dlp would use for the download are passed to
+          FFmpeg, since YouTube media URLs are tied to them.
+        - Requires the ffmpeg binary on PATH.
+        - The whole track is held in memory (about 3.8 MB per minute of audio).
     Example:
-        path = download_audio_to_temp('https://www.youtube.com/watch?v=...')
-        # use the audio file ...
-        os.remove(path)  # caller must clean up the temp file
+        audio = stream_audio_pcm('https://www.youtube.com/watch?v=...')
+        text = transcribe_audio(audio)
     """
-    # Create a unique temporary filename (we remove the file because yt_dlp
-    # will create files based on the `outtmpl` and add the audio extension).
-    fd, base_path = tempfile.mkstemp(prefix='quizly_audio_')
-    os.close(fd)
-    try:
-        os.unlink(base_path)
-    except OSError:
-        pass
+    # Imported here: the web process imports this module (via quiz_app.tasks) but
+    # never builds quizzes, so it should not pay for yt_dlp's extractor registry.
+    import numpy as np
+    import yt_dlp
 
-    outtmpl = base_path
     ydl_opts = {
         'format': 'bestaudio/best',
-        'outtmpl': outtmpl,
         'quiet': True,
         'noplaylist': True,
-        'postprocessors': [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': preferred_codec,
-        }]
     }
 
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        ydl.download([url])
+        info = ydl.extract_info(url, download=False)
 
-    final_path = f"{base_path}.{preferred_codec}"
-    if not os.path.exists(final_path):
-        # Try common audio extensions if the preferred one wasn't created
-        for ext in ('m4a', 'mp3', 'wav', 'aac', 'ogg', 'flac'):
-            p = f"{base_path}.{ext}"
-            if os.path.exists(p):
-                final_path = p
-                break
+    cmd = ['ffmpeg', '-nostdin', '-loglevel', 'error', '-threads', '0']
+    headers = info.get('http_headers') or {}
+    if headers:
+        cmd += ['-headers', ''.join(f'{k}: {v}\r\n' for k, v in headers.items())]
+    cmd += [
+        '-i', info['url'],
+        # Audio only: if the 'best' fallback picked a muxed stream, don't decode video.
+        '-vn', '-sn', '-dn',
+        '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', str(sample_rate),
+        '-',
+    ]
 
-    if not os.path.exists(final_path):
-        raise FileNotFoundError('Audio file was not created by yt_dlp')
+    proc = subprocess.run(cmd, capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"FFmpeg failed to decode audio: {proc.stderr.decode(errors='replace').strip()}")
+    if not proc.stdout:
+        raise RuntimeError('No audio was decoded from the stream')
 
-    return final_path
+    return np.frombuffer(proc.stdout, np.int16).astype(np.float32) / 32768.0
@@ -1,14 +1,20 @@
-"""Pipeline to download, transcribe, and generate quiz JSON from YouTube audio."""
+"""Pipeline to stream, transcribe, and generate quiz JSON from YouTube audio."""
 
-import os
-import re
-import json
+from concurrent.futures import ThreadPoolExecutor
 
-from typing import Optional
+import orjson
+from django.core.cache import cache
 
-from .download import download_audio_to_temp
-from .transcription import transcribe_audio
-from core.common.clients.gemini import generate_quiz
+from .download import stream_audio_pcm
+from .transcription import preload_model, transcribe_audio
+from .utils import extract_youtube_id
+from core.common.clients.gemini import DEFAULT_MODEL, discard_cached_quiz, generate_quiz
+
+# Transcripts are cached per (whisper model, video id): a video that was already
+# processed skips download and transcription, and with the same transcript the
+# Gemini quiz cache in generate_quiz() then hits as well.
+TRANSCRIPT_CACHE_PREFIX = "yt-transcript:"
+TRANSCRIPT_CACHE_TIMEOUT = 30 * 24 * 3600
 
 
 class InvalidQuizError(Exception):
@@ -16,53 +22,70 @@ class InvalidQuizError(Exception):
     pass
 
 
-def _strip_code_fences(text: str) -> str:
-    """Remove wrapping triple-backtick code fences (e.g. ```json ... ```)."""
-    if not text:
-        return text
-    s = text.strip()
-    s = re.sub(r'^\s*```[^\n]*\n?', '', s, count=1)
-    s = re.sub(r'\n?```\s*$', '', s, count=1)
-    return s.strip()
+def _transcribe_url(url: str, whisper_model: str) -> str:
+    """Stream and transcribe url, loading the whisper model while the audio decodes."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        model_ready = executor.submit(preload_model, whisper_model)
+        audio = stream_audio_pcm(url)
+        model_ready.result()
+    return transcribe_audio(audio, whisper_model)
+
+
+def _get_transcript(url: str, whisper_model: str) -> str:
+    """Return the transcript for url, from the cache when the video was seen before."""
+    video_id = extract_youtube_id(url)
+    if video_id is None:
+        return _transcribe_url(url, whisper_model)
+
+    key = f"{TRANSCRIPT_CACHE_PREFIX}{whisper_model}:{video_id}"
+    transcript = cache.get(key)
+    if transcript is None:
+        transcript = _transcribe_url(url, whisper_model)
+        if transcript:
+            cache.set(key, transcript, TRANSCRIPT_CACHE_TIMEOUT)
+    return transcript
 
 
 def build_quiz_from_youtube(
     url: str,
     whisper_model: str = "turbo",
-    gemini_model: str = "gemini-2.5-flash",
+    gemini_model: str = DEFAULT_MODEL,
 ) -> dict:
     """
-    Download audio from a YouTube URL, transcribe it and generate a quiz with Gemini.
-    Returns a dict (parsed JSON) matching the expected quiz structure.
-    Raises InvalidQuizError if the returned text cannot be parsed to JSON.
+    Stream audio from a YouTube URL, transcribe it and generate a quiz with Gemini.
+    The audio is decoded in memory (no temp file) while the whisper model is loaded in
+    a background thread, so a worker's first job does not pay for the two one after
+    the other. Transcripts are cached by video id (any URL form of the same video
+    hits), so repeat videos skip straight to the cached Gemini result.
+    Returns a dict (parsed JSON) matching the expected quiz structure, plus the source
+    text under "transcript" so the caller can store it with the quiz.
+    Raises InvalidQuizError if the returned text is blank, cannot be parsed to JSON or is
+    not a JSON object; the cached Gemini answer is discarded first, so a retry asks again.
     """
-    temp_path: Optional[str] = None
+    transcript = _get_transcript(url, whisper_model)
+    quiz_text = generate_quiz(transcript, model=gemini_model)
     try:
-        temp_path = download_audio_to_temp(url)
-        transcript = transcribe_audio(temp_path, whisper_model)
-        quiz_text = generate_quiz(transcript, model=gemini_model)
-
-        # strip code fences -> still a string
-        stripped = _strip_code_fences(quiz_text)
-        if not stripped:
-            raise InvalidQuizError("Blank answer from the quiz generator.")
-
-        # If generate_quiz already returned a dict, handle that too:
-        if isinstance(stripped, dict):
-            return stripped
-
-        # now parse JSON
-        try:
-            quiz_obj = json.loads(stripped)
-        except json.JSONDecodeError as e:
-            # optionally: include underlying text in logs but not in error to client
-            raise InvalidQuizError(
-                "The response provided by the generator is not valid JSON.") from e
-        return quiz_obj
-
-    finally:
-        if temp_path:
-            try:
-                os.remove(temp_path)
-            except Exception:
-                pass
+        quiz_obj = _parse_quiz(quiz_text)
+    except InvalidQuizError:
+        discard_cached_quiz(transcript, model=gemini_model)
+        raise
+    quiz_obj["transcript"] = transcript
+    return quiz_obj
+
+
+def _parse_quiz(quiz_text: str) -> dict:
+    """Parse the generator's answer into a dict, raising InvalidQuizError if it is unusable."""
+    # Structured output (QuizSchema) returns bare JSON, so no fence stripping is needed.
+    if not quiz_text or not quiz_text.strip():
+        raise InvalidQuizError("Blank answer from the quiz generator.")
+
+    try:
+        quiz_obj = orjson.loads(quiz_text)
+    except orjson.JSONDecodeError as e:
+        # e.g. a response cut off at the output limit; the text stays out of the client error
+        raise InvalidQuizError(
+            "The response provided by the generator is not valid JSON.") from e
+
+    if not isinstance(quiz_obj, dict):
+        raise InvalidQuizError("The response provided by the generator is not a JSON object.")
+    return quiz_obj
@@ -1,44 +1,140 @@
-def transcribe_audio(file_path: str, whisper_model: str = 'turbo') -> str:
+"""Audio transcription backed by faster-whisper (or openai-whisper), one model per process."""
+
+import threading
+from typing import TYPE_CHECKING, Union
+
+from django.conf import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Loaded models keyed by model name. Both backends pick the device themselves
+# (CUDA when available, else CPU), so the name alone identifies a model.
+_MODEL_CACHE = {}
+_MODEL_LOCK = threading.Lock()
+
+# Silence must last at least this long before faster-whisper's VAD cuts it out.
+VAD_PARAMETERS = {"min_silence_duration_ms": 500}
+
+
+def _load_backend():
+    """Return (name, module) for the first importable backend, preferring faster-whisper."""
+    try:
+        import faster_whisper
+        return "faster_whisper", faster_whisper
+    except Exception:
+        pass
+    try:
+        import whisper
+        return "whisper", whisper
+    except Exception:
+        return None, None
+
+
+def _load_model(backend, module, whisper_model: str):
+    """Load whisper_model with the given backend.
+
+    faster-whisper runs CTranslate2 with INT8 weights (FP16 activations on GPU) on
+    settings.WHISPER_CPU_THREADS threads, so concurrent worker children don't
+    oversubscribe the cores.
+    openai-whisper models keep the FP32 weights load_model() returns: transcribe()
+    handles FP16 itself via fp16=True on CUDA, and its LayerNorm runs in FP32, so
+    a .half() model breaks inference.
     """
-    Transcribe an audio file to text using the whisper package.
-    This function attempts to import the whisper module at runtime and, if
-    available, loads the requested whisper model to transcribe the audio file
-    located at file_path. The transcription text (if present) is returned as a
-    string.
+    if backend == "faster_whisper":
+        import ctranslate2
+
+        on_gpu = ctranslate2.get_cuda_device_count() > 0
+        return module.WhisperModel(
+            whisper_model,
+            device="cuda" if on_gpu else "cpu",
+            compute_type="int8_float16" if on_gpu else "int8",
+            cpu_threads=settings.WHISPER_CPU_THREADS,
+        )
+    return module.load_model(whisper_model)
+
+
+def _get_model(backend, module, whisper_model: str):
+    """Return the cached model, loading it on first use.
+
+    The lock keeps concurrent first calls (e.g. threaded workers) from loading the
+    same weights twice; later calls return without taking it.
+    """
+    model = _MODEL_CACHE.get(whisper_model)
+    if model is None:
+        with _MODEL_LOCK:
+            model = _MODEL_CACHE.get(whisper_model)
+            if model is None:
+                model = _load_model(backend, module, whisper_model)
+                _MODEL_CACHE[whisper_model] = model
+    return model
+
+
+def preload_model(whisper_model: str = 'turbo') -> None:
+    """Load whisper_model into the process cache ahead of transcribe_audio.
+
+    Lets callers overlap the model load with other work (e.g. the audio
+    download). Does nothing if no backend is installed; transcribe_audio
+    reports that case.
+    """
+    backend, module = _load_backend()
+    if backend is not None:
+        _get_model(backend, module, whisper_model)
+
+
+def transcribe_audio(audio: Union[str, "np.ndarray"], whisper_model: str = 'turbo') -> str:
+    """
+    Transcribe audio to text using faster-whisper, or the whisper package.
+    This function imports a backend at runtime (faster_whisper first, then
+    whisper) and uses the requested whisper model to transcribe audio, given
+    either as a file path or as 16 kHz mono float32 samples. The model is loaded
+    once per process and reused by later calls (see _get_model). The
+    transcription text (if present) is returned as a string.
     - Parameters
-        - file_path : str
-            Path to the audio file to be transcribed. The path should point to a
-            file format supported by the installed whisper backend.
+        - audio : str or numpy.ndarray
+            Path to an audio file (decoded by the backend via FFmpeg), or a 1-D
+            float32 array sampled at 16 kHz such as download.stream_audio_pcm()
+            returns. Both backends accept either form.
         - whisper_model : str, optional
-            Name of the whisper model to load (default: 'turbo'). The exact model
-            names available depend on the installed whisper implementation.
+            Name of the whisper model to load (default: 'turbo'). Both backends
+            accept the standard names (tiny ... large-v3, turbo).
     - Returns
         - str
-            The transcribed text. If the underlying transcription result does not
-            contain a 'text' field, an empty string is returned.
+            The transcribed text (the concatenated segment texts). If the
+            underlying transcription result has no text, an empty string is returned.
     - Raises
         - RuntimeError
-            If the whisper package is not installed or no transcription backend is
-            available.
+            If neither faster-whisper nor whisper is installed.
         - Exception
-            Any exceptions raised by the whisper package when loading the model or
+            Any exceptions raised by the backend when loading the model or
             during transcription are propagated to the caller.
     - Notes
-        - The function imports whisper lazily; installing or upgrading the whisper
+        - The function imports the backend lazily; installing or upgrading the whisper
             package after the program starts will not be detected unless the process
             re-imports the module or restarts.
         - The semantics and available model names depend on the whisper package
             implementation/version installed in the environment.
+        - With faster-whisper, silent stretches are skipped via its built-in Silero
+            VAD (VAD_PARAMETERS); the openai-whisper fallback decodes all audio.
     """
-    try:
-        import whisper
-    except Exception:
-        whisper = None
+    backend, module = _load_backend()
+
+    if backend == 'faster_whisper':
+        model = _get_model(backend, module, whisper_model)
+        # Greedy decoding, like openai-whisper's transcribe() default. Silero VAD
+        # drops non-speech stretches (intros, pauses) before they reach the encoder.
+        segments, _info = model.transcribe(
+            audio,
+            beam_size=1,
+            vad_filter=True,
+            vad_parameters=VAD_PARAMETERS,
+        )
+        return ''.join(segment.text for segment in segments)
 
-    if whisper is not None:
-        model = whisper.load_model(whisper_model)
-        result = model.transcribe(file_path)
+    if backend == 'whisper':
+        model = _get_model(backend, module, whisper_model)
+        result = model.transcribe(audio, fp16=model.device.type == 'cuda')
         return result.get('text', '')
 
     raise RuntimeError(
-        'No transcription backend available: install `whisper`')
+        'No transcription backend available: install `faster-whisper` or `whisper`')
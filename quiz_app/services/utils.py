@@ -1,55 +1,103 @@
-import re
-from django.core.validators import RegexValidator
-
-
 """
 Utility definitions for validating YouTube URLs used by the quiz application.
 This module provides:
-- YOUTUBE_REGEX: a compiled regular expression that matches common YouTube URL forms
-    and captures the 11-character video identifier in a named group "id".
-- YOUTUBE_URL_VALIDATOR: a Django RegexValidator instance configured with YOUTUBE_REGEX,
-    a user-facing error message, and an error code for integration with Django forms/models.
+- extract_youtube_id(url): returns the 11-character video id of a YouTube URL, or None.
+    It parses the URL with urllib.parse.urlsplit, looks the host up in a frozenset and
+    checks the id characters, without running a regex.
+- validate_youtube_url(value): a Django validator built on it, with the user-facing
+    message "Invalid YouTube-URL." and code "invalid_youtube_url".
 Behavior and supported URL formats:
-- Matches full and partial URLs with optional scheme:
+- Matches full and partial URLs with optional scheme (http/https):
         https://www.youtube.com/watch?v=VIDEOID
         http://youtube.com/watch?v=VIDEOID
-        www.youtube.com/watch?v=VIDEOID
+        m.youtube.com/watch?feature=share&v=VIDEOID
         youtube.com/watch?v=VIDEOID
 - Matches shortened YouTube URLs:
         https://youtu.be/VIDEOID
         youtu.be/VIDEOID
 - Matches YouTube Shorts URLs:
         https://www.youtube.com/shorts/VIDEOID
-- The VIDEOID is expected to be exactly 11 characters long, consisting of word characters
-    (letters, digits, underscore) and hyphens.
-- Query parameters or fragments following the ID are allowed and ignored by the capture.
-- Matching is case-insensitive.
+- The VIDEOID is expected to be exactly 11 characters long, consisting of ASCII letters,
+    digits, underscore and hyphens.
+- Query parameters or fragments following the ID are allowed and ignored.
+- Hosts and path keywords match case-insensitively; ports, userinfo, trailing slashes
+    and whitespace or control characters anywhere in the string are rejected.
 Usage examples:
 - Extract the video id:
-        match = YOUTUBE_REGEX.match(url)
-        if match:
-                video_id = match.group("id")
+        video_id = extract_youtube_id(url)
 - Use in Django model or form field:
-        url = models.URLField(validators=[YOUTUBE_URL_VALIDATOR])
+        url = models.URLField(validators=[validate_youtube_url])
 Limitations:
-- The regex validates common URL shapes but does not verify that the video actually exists
+- The check covers common URL shapes but does not verify that the video actually exists
     on YouTube or that the ID corresponds to an accessible resource.
 - Nonstandard but valid YouTube URL variants (e.g., additional path segments before the ID)
-    may not be matched.
-Error reporting:
-- YOUTUBE_URL_VALIDATOR uses message "Invalid YouTube-URL." and code "invalid_youtube_url".
+    are not matched.
 """
 
-YOUTUBE_REGEX = re.compile(
-    r'^(https?://)?(www\.)?'
-    r'(youtube\.com/(watch\?v=|shorts/)|youtu\.be/)'
-    r'(?P<id>[\w-]{11})'
-    r'([&?].*)?$',
-    re.IGNORECASE
-)
-
-YOUTUBE_URL_VALIDATOR = RegexValidator(
-    regex=YOUTUBE_REGEX,
-    message="Invalid YouTube-URL.",
-    code="invalid_youtube_url",
-)
+import string
+from urllib.parse import parse_qs, urlsplit
+
+from django.core.exceptions import ValidationError
+
+_YT_HOSTS = frozenset({
+    "youtube.com", "www.youtube.com", "m.youtube.com", "youtu.be", "www.youtu.be",
+})
+_YT_SHORT_HOSTS = frozenset({"youtu.be", "www.youtu.be"})
+_ID_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+_ID_LENGTH = 11
+
+
+def _is_video_id(value):
+    return len(value) == _ID_LENGTH and _ID_CHARS.issuperset(value)
+
+
+def extract_youtube_id(url):
+    """
+    Return the 11-character video id of a YouTube URL, or None if url is not one.
+    Accepts youtube.com/watch?v=ID (v anywhere in the query string),
+    youtube.com/shorts/ID and youtu.be/ID, with or without scheme (http/https),
+    on the www. and m. (mobile) hosts too, matching hosts and path keywords
+    case-insensitively. Strings containing whitespace or control characters are
+    rejected outright.
+    """
+    if not isinstance(url, str):
+        return None
+    # urlsplit() silently drops tabs and newlines (WHATWG behaviour), which would let
+    # "youtu.be/dQw4w9\tWgXcQ" through and store it verbatim; isprintable() is False for
+    # every whitespace/control character except the plain space, checked separately.
+    if not url.isprintable() or " " in url:
+        return None
+    if "://" not in url:
+        url = "//" + url
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    if parts.scheme.lower() not in ("", "http", "https"):
+        return None
+
+    host = parts.netloc.lower()
+    if host not in _YT_HOSTS:
+        return None
+
+    path = parts.path
+    if host in _YT_SHORT_HOSTS:
+        video_id = path[1:]
+    elif path.lower() == "/watch":
+        video_id = parse_qs(parts.query).get("v", [""])[0]
+    elif path[:8].lower() == "/shorts/":
+        video_id = path[8:]
+    else:
+        return None
+
+    return video_id if _is_video_id(video_id) else None
+
+
+def validate_youtube_url(value):
+    """
+    Model/serializer validator for YouTube video URLs, built on extract_youtube_id().
+    Raises ValidationError("Invalid YouTube-URL.", code="invalid_youtube_url"). As a
+    module-level function it serializes into migrations by import path.
+    """
+    if extract_youtube_id(value) is None:
+        raise ValidationError("Invalid YouTube-URL.", code="invalid_youtube_url")
@@ -0,0 +1,75 @@
+"""Celery tasks for building quizzes in the background."""
+
+from celery import shared_task
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from core.common.clients.gemini import discard_cached_quiz
+
+from quiz_app.api.serializers import QuizSerializer
+from quiz_app.models import QuizJob
+from quiz_app.services.quiz_builder import build_quiz_from_youtube
+
+
+# Past the soft limit SoftTimeLimitExceeded is raised inside the task and the job is
+# marked FAILURE; the hard limit kills the child, so QuizJobStatusAPIView reports a
+# job still STARTED after BUILD_QUIZ_TIME_LIMIT as failed.
+BUILD_QUIZ_SOFT_TIME_LIMIT = 15 * 60
+BUILD_QUIZ_TIME_LIMIT = BUILD_QUIZ_SOFT_TIME_LIMIT + 60
+# How long a job may wait in the queue. A job still PENDING after this plus
+# BUILD_QUIZ_TIME_LIMIT lost its message (e.g. the worker died after taking it but
+# before marking it STARTED) and is reported as failed as well.
+BUILD_QUIZ_QUEUE_TIMEOUT = 60 * 60
+
+
+# Job state is kept on QuizJob; Celery stores no results.
+@shared_task(
+    ignore_result=True,
+    soft_time_limit=BUILD_QUIZ_SOFT_TIME_LIMIT,
+    time_limit=BUILD_QUIZ_TIME_LIMIT,
+)
+def build_quiz_task(job_id):
+    """
+    Run the YouTube-to-quiz pipeline for the QuizJob job_id and store the quiz.
+
+    Marks the job STARTED (returning None without doing anything if it is no longer
+    PENDING, e.g. already reported as stale), downloads and transcribes the video, generates the quiz
+    via build_quiz_from_youtube(job.video_url), validates it with QuizSerializer and
+    saves it with the job's user as owner, storing the transcript (compressed) with
+    it. The job is then marked SUCCESS and linked to the quiz, or marked FAILURE if
+    any step raises.
+
+    Returns:
+    - int | None: The id of the created quiz, or None if the job was not PENDING.
+
+    Raises:
+    - InvalidQuizError / rest_framework.exceptions.ValidationError if the
+        generated quiz is malformed; the exception is re-raised after the job is
+        marked FAILURE so it still shows up in the worker log. The cached Gemini
+        answer is discarded in either case.
+    """
+    job = QuizJob.objects.select_related("user").get(pk=job_id)
+    jobs = QuizJob.objects.filter(pk=job_id)
+    # update() skips auto_now, and updated_at is what the stale-job check reads.
+    if not jobs.filter(status=QuizJob.Status.PENDING).update(
+            status=QuizJob.Status.STARTED, updated_at=timezone.now()):
+        return None
+
+    try:
+        quiz_dict = build_quiz_from_youtube(job.video_url)
+        transcript = quiz_dict.pop("transcript", None)
+        quiz_dict["video_url"] = job.video_url
+
+        serializer = QuizSerializer(data=quiz_dict, context={"user": job.user})
+        if not serializer.is_valid():
+            # Valid JSON can still break the quiz rules (e.g. 3 options); don't let the
+            # Gemini cache hand the same answer to the next attempt.
+            discard_cached_quiz(transcript)
+            raise ValidationError(serializer.errors)
+        quiz = serializer.save(transcript=transcript)
+    except Exception:
+        jobs.update(status=QuizJob.Status.FAILURE, updated_at=timezone.now())
+        raise
+
+    jobs.update(status=QuizJob.Status.SUCCESS, quiz=quiz, updated_at=timezone.now())
+    return quiz.id
@@ -1,10 +1,21 @@
+from datetime import timedelta
 from unittest import mock
 
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.test import SimpleTestCase
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
+from django.utils import timezone
+from google.genai import types
 
-from quiz_app.models import Quiz, Question
+from core.common.clients.gemini import generate_quiz
+from quiz_app.models import Quiz, QuizJob, Question
+from quiz_app.services.quiz_builder import InvalidQuizError, build_quiz_from_youtube
+from quiz_app.services.utils import extract_youtube_id, validate_youtube_url
+from quiz_app.tasks import BUILD_QUIZ_QUEUE_TIMEOUT, BUILD_QUIZ_TIME_LIMIT, build_quiz_task
 
 
 class QuizApiTests(APITestCase):
@@ -28,11 +39,34 @@ class QuizApiTests(APITestCase):
 
     Tests
     - test_create_quiz_from_youtube_url:
-        - Patches the external builder function to return the sample payload.
+        - Patches the external builder function to return the sample payload and runs the
+          Celery task eagerly instead of sending it to a broker.
         - Authenticates as `self.user` and POSTs the YouTube URL to the create-quiz endpoint.
-        - Asserts a 201 CREATED response, that one Quiz was persisted, that its
-          `video_url` matches the provided URL, and that the quiz contains the expected
-          number of Question objects (2).
+        - Asserts a 202 ACCEPTED response with a job id, that one Quiz was persisted, that its
+          `video_url` matches the provided URL, that the quiz contains the expected
+          number of Question objects (2), that the transcript was stored with it, and that
+          the QuizJob is SUCCESS and linked to it.
+
+    - test_create_quiz_rejects_non_youtube_url:
+        - POSTs a non-YouTube URL and asserts a 400 BAD REQUEST without enqueuing a job.
+
+    - test_create_quiz_normalizes_scheme_less_url:
+        - POSTs "youtu.be/<id>" and asserts the QuizJob is stored with the https:// URL.
+
+    - test_create_quiz_marks_job_failed_when_enqueue_fails:
+        - Makes the task's delay() raise and asserts the QuizJob is stored as FAILURE.
+
+    - test_job_status_returns_quiz_only_to_owner:
+        - Creates a finished QuizJob linked to a quiz owned by `self.user`.
+        - Asserts the owner receives status SUCCESS with the quiz, and another user gets 404.
+
+    - test_job_status_fails_stale_started_job:
+        - Creates a job that has been STARTED for longer than BUILD_QUIZ_TIME_LIMIT and
+          asserts it is reported and stored as FAILURE.
+
+    - test_job_status_fails_stale_pending_job:
+        - Creates a job PENDING for longer than the queue timeout plus BUILD_QUIZ_TIME_LIMIT,
+          asserts it is reported and stored as FAILURE, and that a late task run skips it.
 
     - test_list_quizzes_returns_only_authenticated_users_items:
         - Creates one quiz for `self.user` and another for `self.other_user`.
@@ -45,10 +79,23 @@ class QuizApiTests(APITestCase):
         - Authenticates as `self.user` and attempts to GET the detail endpoint for that quiz.
         - Asserts a 403 FORBIDDEN response to enforce that non-owners cannot view details.
 
+    - test_detail_does_not_load_owner_row:
+        - GETs an own quiz and asserts the fixed query count (ETag aggregate, quiz, questions),
+          i.e. the ownership check does not fetch the auth_user row.
+
+    - test_detail_returns_304_for_matching_etag:
+        - GETs an own quiz, replays its ETag in If-None-Match and asserts 304 NOT MODIFIED.
+        - Asserts another user sending the same ETag still gets 403, and that editing a
+          question changes the ETag.
+
     - test_patch_updates_quiz_title:
         - Creates a quiz owned by `self.user`.
         - Authenticates as `self.user` and PATCHes the quiz to change the title.
         - Asserts a 200 OK response and verifies the change persisted in the database.
+
+    - test_question_options_length_enforced_by_database:
+        - Asserts that saving a Question with three options directly through the ORM
+          is rejected by the question_options_len_4 check constraint.
     """
     def setUp(self):
         self.user = User.objects.create_user(
@@ -92,20 +139,110 @@ class QuizApiTests(APITestCase):
         )
         return quiz
 
-    @mock.patch("quiz_app.api.views.build_quiz_from_youtube")
-    def test_create_quiz_from_youtube_url(self, mock_builder):
-        mock_builder.return_value = self._sample_quiz_payload()
+    @mock.patch(
+        "quiz_app.api.views.build_quiz_task.delay",
+        side_effect=lambda *args: build_quiz_task.apply(args=args),
+    )
+    @mock.patch("quiz_app.tasks.build_quiz_from_youtube")
+    def test_create_quiz_from_youtube_url(self, mock_builder, mock_delay):
+        mock_builder.return_value = {
+            **self._sample_quiz_payload(), "transcript": "spoken text"}
         self.client.force_authenticate(self.user)
 
         response = self.client.post(
             "/api/createQuiz/", {"url": self.youtube_url}, format="json"
         )
 
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_id = response.data["job_id"]
+        mock_delay.assert_called_once_with(job_id)
         self.assertEqual(Quiz.objects.count(), 1)
         quiz = Quiz.objects.first()
         self.assertEqual(quiz.video_url, self.youtube_url)
         self.assertEqual(quiz.questions.count(), 2)
+        self.assertEqual(quiz.transcript, "spoken text")
+        job = QuizJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, QuizJob.Status.SUCCESS)
+        self.assertEqual(job.quiz, quiz)
+
+    @mock.patch("quiz_app.api.views.build_quiz_task.delay")
+    def test_create_quiz_rejects_non_youtube_url(self, mock_delay):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(
+            "/api/createQuiz/", {"url": "https://vimeo.com/123456"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_delay.assert_not_called()
+
+    @mock.patch("quiz_app.api.views.build_quiz_task.delay")
+    def test_create_quiz_normalizes_scheme_less_url(self, mock_delay):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(
+            "/api/createQuiz/", {"url": "youtu.be/dQw4w9WgXcQ"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = QuizJob.objects.get(pk=response.data["job_id"])
+        self.assertEqual(job.video_url, "https://youtu.be/dQw4w9WgXcQ")
+        mock_delay.assert_called_once_with(str(job.id))
+
+    @mock.patch("quiz_app.api.views.build_quiz_task.delay", side_effect=OSError("broker down"))
+    def test_create_quiz_marks_job_failed_when_enqueue_fails(self, mock_delay):
+        self.client.force_authenticate(self.user)
+        with self.assertRaises(OSError):
+            self.client.post("/api/createQuiz/", {"url": self.youtube_url}, format="json")
+
+        self.assertEqual(QuizJob.objects.get(user=self.user).status, QuizJob.Status.FAILURE)
+
+    def test_job_status_fails_stale_started_job(self):
+        job = QuizJob.objects.create(
+            user=self.user, video_url=self.youtube_url, status=QuizJob.Status.STARTED)
+        QuizJob.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - timedelta(seconds=BUILD_QUIZ_TIME_LIMIT + 1))
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get(f"/api/jobs/{job.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "FAILURE")
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuizJob.Status.FAILURE)
+
+    @mock.patch("quiz_app.tasks.build_quiz_from_youtube")
+    def test_job_status_fails_stale_pending_job(self, mock_builder):
+        job = QuizJob.objects.create(user=self.user, video_url=self.youtube_url)
+        QuizJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(
+            seconds=BUILD_QUIZ_QUEUE_TIMEOUT + BUILD_QUIZ_TIME_LIMIT + 1))
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get(f"/api/jobs/{job.id}/")
+        self.assertEqual(response.data["status"], "FAILURE")
+
+        self.assertIsNone(build_quiz_task.apply(args=(str(job.id),)).get())
+        mock_builder.assert_not_called()
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuizJob.Status.FAILURE)
+
+    def test_job_status_returns_quiz_only_to_owner(self):
+        quiz = self._create_quiz_for_user(self.user, title="Done")
+        job = QuizJob.objects.create(
+            user=self.user,
+            video_url=self.youtube_url,
+            status=QuizJob.Status.SUCCESS,
+            quiz=quiz,
+        )
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get(f"/api/jobs/{job.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "SUCCESS")
+        self.assertEqual(response.data["quiz"]["title"], "Done")
+
+        self.client.force_authenticate(self.other_user)
+        response = self.client.get(f"/api/jobs/{job.id}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_list_quizzes_returns_only_authenticated_users_items(self):
         self._create_quiz_for_user(self.user, title="Mine")
@@ -124,6 +261,37 @@ class QuizApiTests(APITestCase):
         response = self.client.get(f"/api/quizzes/{quiz.id}/")
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_detail_does_not_load_owner_row(self):
+        quiz = self._create_quiz_for_user(self.user)
+        self.client.force_authenticate(self.user)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/api/quizzes/{quiz.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_returns_304_for_matching_etag(self):
+        quiz = self._create_quiz_for_user(self.user)
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(f"/api/quizzes/{quiz.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response.headers["ETag"]
+
+        response = self.client.get(f"/api/quizzes/{quiz.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.force_authenticate(self.other_user)
+        response = self.client.get(f"/api/quizzes/{quiz.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        question = quiz.questions.get()
+        question.answer = "B"
+        question.save()
+        self.client.force_authenticate(self.user)
+        response = self.client.get(f"/api/quizzes/{quiz.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
     def test_patch_updates_quiz_title(self):
         quiz = self._create_quiz_for_user(self.user, title="Old title")
         self.client.force_authenticate(self.user)
@@ -134,3 +302,143 @@ class QuizApiTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         quiz.refresh_from_db()
         self.assertEqual(quiz.title, "New title")
+
+    def test_question_options_length_enforced_by_database(self):
+        quiz = self._create_quiz_for_user(self.user)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Question.objects.create(
+                quiz=quiz,
+                question_title="Q2?",
+                question_options=["A", "B", "C"],
+                answer="A",
+            )
+
+
+class QuizBuilderCacheTests(SimpleTestCase):
+    """
+    Tests for the transcript cache in build_quiz_from_youtube.
+
+    - test_same_video_is_transcribed_once:
+        - Builds a quiz twice for the same video given as two different URL forms and
+          asserts the audio is streamed/transcribed only on the first call.
+    """
+    def tearDown(self):
+        cache.clear()
+
+    @mock.patch("quiz_app.services.quiz_builder.generate_quiz", return_value='{"title": "T"}')
+    @mock.patch("quiz_app.services.quiz_builder._transcribe_url", return_value="transcript")
+    def test_same_video_is_transcribed_once(self, mock_transcribe, mock_generate):
+        first = build_quiz_from_youtube("https://youtu.be/dQw4w9WgXcQ")
+        second = build_quiz_from_youtube("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+
+        self.assertEqual(first, second)
+        mock_transcribe.assert_called_once()
+        self.assertEqual(mock_generate.call_count, 2)
+        mock_generate.assert_called_with("transcript", model="gemini-2.5-flash")
+
+
+class GeminiQuizCacheTests(SimpleTestCase):
+    """
+    Tests for the quiz cache in generate_quiz.
+
+    - test_finished_response_is_cached:
+        - A response with finish_reason STOP is served from the cache on the second call.
+    - test_truncated_response_is_not_cached:
+        - A response cut off at MAX_TOKENS is returned but not cached, so the API is asked again.
+    - test_unparseable_quiz_is_discarded:
+        - A finished response that is not valid JSON makes build_quiz_from_youtube raise
+          InvalidQuizError and drops the cached answer, so a retry asks the API again.
+    """
+    def tearDown(self):
+        cache.clear()
+
+    def _mock_client(self, text, finish_reason=types.FinishReason.STOP):
+        client = mock.Mock()
+        client.models.generate_content.return_value = mock.Mock(
+            text=text, candidates=[mock.Mock(finish_reason=finish_reason)])
+        return client
+
+    def test_finished_response_is_cached(self):
+        client = self._mock_client('{"title": "T"}')
+        with mock.patch("core.common.clients.gemini.get_client", return_value=client):
+            first = generate_quiz("transcript")
+            second = generate_quiz("transcript")
+
+        self.assertEqual(first, second)
+        client.models.generate_content.assert_called_once()
+
+    def test_truncated_response_is_not_cached(self):
+        client = self._mock_client('{"title": "T", "quest', types.FinishReason.MAX_TOKENS)
+        with mock.patch("core.common.clients.gemini.get_client", return_value=client):
+            generate_quiz("transcript")
+            generate_quiz("transcript")
+
+        self.assertEqual(client.models.generate_content.call_count, 2)
+
+    @mock.patch("quiz_app.services.quiz_builder._transcribe_url", return_value="transcript")
+    def test_unparseable_quiz_is_discarded(self, mock_transcribe):
+        client = self._mock_client('{"title": "T"')
+        with mock.patch("core.common.clients.gemini.get_client", return_value=client):
+            for _ in range(2):
+                with self.assertRaises(InvalidQuizError):
+                    build_quiz_from_youtube("https://youtu.be/dQw4w9WgXcQ")
+
+        self.assertEqual(client.models.generate_content.call_count, 2)
+
+
+class YouTubeUrlTests(SimpleTestCase):
+    """
+    Table tests for extract_youtube_id and validate_youtube_url.
+
+    - test_accepted_urls:
+        - Watch, shorts and youtu.be forms, with and without scheme, on the www./m. hosts
+          and with "v" anywhere in the query string, all yield the video id.
+    - test_rejected_urls:
+        - Trailing slashes, ports, userinfo, wrong id lengths, other hosts/schemes and
+          embedded whitespace or control characters yield None and fail validation
+          with code "invalid_youtube_url".
+    """
+    VIDEO_ID = "dQw4w9WgXcQ"
+
+    ACCEPTED = [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "http://youtube.com/watch?v=dQw4w9WgXcQ&t=42",
+        "https://m.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+        "youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+        "youtu.be/dQw4w9WgXcQ?si=abc",
+        "HTTPS://WWW.YOUTUBE.COM/WATCH?v=dQw4w9WgXcQ",
+    ]
+
+    REJECTED = [
+        "https://youtu.be/dQw4w9WgXcQ/",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ/",
+        "https://youtube.com:8080/watch?v=dQw4w9WgXcQ",
+        "https://user@youtu.be/dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXc",
+        "https://youtu.be/dQw4w9WgXcQQ",
+        "https://www.youtube.com/watch?v=dQw4w9WgXc$",
+        "https://vimeo.com/12345678901",
+        "ftp://youtu.be/dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9\tWgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ\n",
+        "https://you tu.be/dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9\x00WgXcQ",
+        "",
+    ]
+
+    def test_accepted_urls(self):
+        for url in self.ACCEPTED:
+            with self.subTest(url=url):
+                self.assertEqual(extract_youtube_id(url), self.VIDEO_ID)
+                validate_youtube_url(url)
+
+    def test_rejected_urls(self):
+        for url in self.REJECTED:
+            with self.subTest(url=url):
+                self.assertIsNone(extract_youtube_id(url))
+                with self.assertRaises(ValidationError) as ctx:
+                    validate_youtube_url(url)
+                self.assertEqual(ctx.exception.code, "invalid_youtube_url")